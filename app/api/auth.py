@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from app.core.database import get_db
-from app.core.security import verify_password, get_password_hash, create_access_token, verify_token
+from app.core.security import create_access_token, decode_token, token_cache, password_hasher, PasswordHashingOverloaded
 from app.core.config import settings
 from app.models import User
 from app.schemas import UserCreate, UserLogin, UserResponse, Token
@@ -11,81 +12,122 @@ from app.schemas import UserCreate, UserLogin, UserResponse, Token
 router = APIRouter()
 security = HTTPBearer()
 
+def _hashing_overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please retry shortly",
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)}
+    )
+
 @router.post("/register", response_model=UserResponse)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     # Check if user already exists
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = await db.scalar(select(User).where(User.email == user.email))
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user.password)
+    # Create new user (bcrypt runs on the hashing pool, off the event loop)
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except PasswordHashingOverloaded:
+        raise _hashing_overloaded()
     db_user = User(
         name=user.name,
         email=user.email,
         password_hash=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     # Verify user credentials
-    user = db.query(User).filter(User.email == user_credentials.email).first()
-    if not user or not verify_password(user_credentials.password, user.password_hash):
+    user = await db.scalar(select(User).where(User.email == user_credentials.email))
+    try:
+        verified = user is not None and await password_hasher.verify(user_credentials.password, user.password_hash)
+    except PasswordHashingOverloaded:
+        raise _hashing_overloaded()
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade the stored hash when the configured bcrypt cost has changed
+    if password_hasher.needs_rehash(user.password_hash):
+        try:
+            user.password_hash = await password_hasher.hash(user_credentials.password)
+            await db.commit()
+        except PasswordHashingOverloaded:
+            pass  # Keep the old hash; it is upgraded on a later login
+    
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, "uid": user.id}, expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
 
-@router.get("/me", response_model=UserResponse)
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    email = verify_token(credentials.credentials)
-    if email is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+async def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_db)) -> int:
+    """Authenticated user id; verified tokens are cached so the hot path skips the DB"""
+    token = credentials.credentials
     
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
+    cached = token_cache.get(token)
+    if cached is None:
+        payload = decode_token(token)
+        if payload is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        # Tokens issued before the uid claim existed are resolved by email
+        query = select(User.id, User.is_active)
+        if payload.get("uid") is not None:
+            query = query.where(User.id == payload["uid"], User.email == payload["sub"])
+        else:
+            query = query.where(User.email == payload["sub"])
+        user = (await db.execute(query)).first()
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        
+        cached = (user.id, bool(user.is_active))
+        token_cache.put(token, user.id, bool(user.is_active), payload["exp"])
     
-    return user
-
-async def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    email = verify_token(credentials.credentials)
-    if email is None:
+    user_id, is_active = cached
+    if not is_active:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user"
         )
     
-    user = db.query(User).filter(User.email == email).first()
+    return user_id
+
+@router.get("/me", response_model=UserResponse)
+async def get_current_user(user_id: int = Depends(get_current_user_id), db: AsyncSession = Depends(get_db)):
+    user = await db.get(User, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    return user.id
+    return user
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_tokens(mapper, connection, user):
+    # Email, active flag or account changed: re-verify this user's tokens
+    token_cache.invalidate_user(user.id)
@@ -1,31 +1,260 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from typing import List
-import json
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import insert, null, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from datetime import datetime, timezone
+from typing import List, Optional
+import asyncio
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.json_types import json_array_contains
+from app.core.metrics import metrics
+from app.core.write_batcher import write_batcher
 from app.api.auth import get_current_user_id
+from app.api.pagination import keyset_page, page_response
+from app.api.responses import FastJSONResponse, rows_response
+from app.api.resume import similar_resumes
 from app.models import Resume, JobMatch
-from app.schemas import JobMatchCreate, JobMatchResponse
+from app.schemas import JobMatchCreate, JobBatchMatchCreate, JobMatchResponse, JobMatchSummary, CandidateSearch, CandidateResult, SemanticSearch, SimilarResume
 from app.services.ai_analyzer import AIAnalyzer
+from app.services.embeddings import embedder, similarity_search
+from app.services.skill_vectors import skill_vocabulary
+from app.services.tfidf import IdfTable, cosine_scores, term_counts, tfidf_matcher
 
 router = APIRouter()
-security = HTTPBearer()
+
+def _match_columns(include_description: bool) -> list:
+    """Columns of JobMatchSummary; the job description is read only when requested"""
+    return [
+        JobMatch.id, JobMatch.resume_id,
+        JobMatch.job_description if include_description else null().label("job_description"),
+        JobMatch.job_title, JobMatch.match_score, JobMatch.text_similarity, JobMatch.missing_skills,
+        JobMatch.overlapping_skills, JobMatch.suggestions, JobMatch.created_at
+    ]
+
+class MatchFilters:
+    """Optional server-side filters shared by the match list endpoints"""
+    
+    def __init__(
+        self,
+        min_score: Optional[float] = Query(None, ge=0, le=100),
+        job_title: Optional[str] = Query(None, min_length=1, description="Case-insensitive substring"),
+        skill: Optional[str] = Query(None, min_length=1, description="Only matches where this skill overlapped"),
+        missing_skill: Optional[str] = Query(None, min_length=1, description="Only matches missing this skill"),
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ):
+        self.min_score = min_score
+        self.job_title = job_title
+        self.skill = skill
+        self.missing_skill = missing_skill
+        self.created_from = self._as_utc(created_from)
+        self.created_to = self._as_utc(created_to)
+    
+    @staticmethod
+    def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+        # Timestamps are stored as naive UTC
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    
+    def apply(self, query):
+        if self.min_score is not None:
+            query = query.where(JobMatch.match_score >= self.min_score)
+        if self.job_title:
+            pattern = self.job_title.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            query = query.where(JobMatch.job_title.ilike(f"%{pattern}%", escape="\\"))
+        # Skill filters run inside the database against the JSON arrays
+        if self.skill:
+            query = query.where(json_array_contains(JobMatch.overlapping_skills, self.skill))
+        if self.missing_skill:
+            query = query.where(json_array_contains(JobMatch.missing_skills, self.missing_skill))
+        if self.created_from is not None:
+            query = query.where(JobMatch.created_at >= self.created_from)
+        if self.created_to is not None:
+            query = query.where(JobMatch.created_at < self.created_to)
+        return query
+
+def _user_matches_query(user_id: int, include_description: bool):
+    # Ownership is checked by the join, in the same query that reads the page
+    return select(*_match_columns(include_description)).join(
+        Resume, Resume.id == JobMatch.resume_id
+    ).where(Resume.user_id == user_id)
+
+def _score_resumes(analyzer: AIAnalyzer, job_description: str, job_requirements: List[str], requirement_masks: List[int], idf: IdfTable, vectors: list) -> list:
+    """Score (resume_id, skill_bits, term_counts) against requirement bitmasks extracted once per job"""
+    with metrics.span("job_match_scoring_seconds", mode="batch"):
+        # Text similarity of every resume in one sparse matrix-vector product
+        similarities = cosine_scores(idf, term_counts(job_description), [counts for _, _, counts in vectors])
+        
+        scored = []
+        for (resume_id, skill_bits, _), similarity in zip(vectors, similarities):
+            bits = int(skill_bits, 16)
+            # Same result (and order) as matching the resume's extracted skills against the requirements
+            resume_skills = [req for req, mask in zip(job_requirements, requirement_masks) if bits & mask]
+            scored.append((resume_id, analyzer.score_skill_match(resume_skills, job_requirements, float(similarity))))
+        return scored
+
+@router.post("/match/batch", response_model=List[JobMatchResponse])
+async def match_resumes_with_job_description(
+    job_data: JobBatchMatchCreate,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Match one job description against many resumes, best match first"""
+    # Get resumes (only the columns scoring needs)
+    query = select(Resume).options(
+        load_only(
+            Resume.id, Resume.user_id, Resume.skill_bits, Resume.skill_vocab_version,
+            Resume.term_counts, Resume.term_counts_version
+        )
+    ).where(Resume.user_id == user_id)
+    if job_data.resume_ids is not None:
+        query = query.where(Resume.id.in_(job_data.resume_ids))
+    resumes = (await db.scalars(query)).all()
+    
+    if job_data.resume_ids is not None:
+        missing_ids = set(job_data.resume_ids) - {resume.id for resume in resumes}
+        if missing_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Resumes not found: {sorted(missing_ids)}"
+            )
+    
+    if not resumes:
+        return []
+    
+    try:
+        # Bring skill vectors and term counts computed under an older vocabulary or tokenizer up to date
+        stale = await db.run_sync(lambda session: [skill_vocabulary.refresh(session, resume) for resume in resumes])
+        idf = await db.run_sync(tfidf_matcher.prepare, resumes)
+        vectors = [(resume.id, resume.skill_bits, resume.term_counts) for resume in resumes]
+        if any(stale) or db.dirty:
+            await db.commit()
+        
+        # Extract the job requirements once; resumes that can satisfy a
+        # requirement have its vocabulary bit set (unknown skills never match)
+        analyzer = AIAnalyzer()
+        job_requirements = analyzer.extract_job_requirements(job_data.job_description)
+        analyzer_skills = set(analyzer.skill_keywords)
+        requirement_masks = await db.run_sync(lambda session: [
+            skill_vocabulary.skill_mask(session, [req]) if req.lower() in analyzer_skills else 0
+            for req in job_requirements
+        ])
+        
+        # Scoring many resumes is CPU-bound; keep it off the event loop
+        scored = await asyncio.to_thread(
+            _score_resumes, analyzer, job_data.job_description, job_requirements, requirement_masks, idf, vectors
+        )
+        
+        # Save all job match results in one bulk insert
+        rows = [
+            {
+                "resume_id": resume_id,
+                "job_description": job_data.job_description,
+                "job_title": job_data.job_title,
+                "match_score": match["match_score"],
+                "text_similarity": match["text_similarity"],
+                "missing_skills": match["missing_skills"],
+                "overlapping_skills": match["matching_skills"],
+                "suggestions": match["suggestions"]
+            }
+            for resume_id, match in scored
+        ]
+        matches = (await db.execute(
+            insert(JobMatch).returning(*_match_columns(True), sort_by_parameter_order=True),
+            rows
+        )).all()
+        await db.commit()
+        
+        # Rank by coverage blended with text similarity, so resumes that cover
+        # the requirements but read nothing like the job do not tie at the top
+        weight = settings.MATCH_RANK_TEXT_WEIGHT
+        return rows_response(sorted(
+            matches,
+            key=lambda match: (AIAnalyzer.rank_score(match.match_score, match.text_similarity, weight), match.match_score),
+            reverse=True
+        ))
+        
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error matching with job description: {str(e)}"
+        )
+
+@router.post("/search", response_model=List[CandidateResult])
+async def search_candidates(
+    search: CandidateSearch,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Top-k of the user's resumes for a job description or skill list, via the skill index"""
+    analyzer = AIAnalyzer()
+    if search.skills:
+        requirements = [skill.title() for skill in search.skills]
+        searchable = requirements
+    elif search.job_description:
+        # Same requirements (and matchable skills) as match_with_job
+        requirements = analyzer.extract_job_requirements(search.job_description)
+        analyzer_skills = set(analyzer.skill_keywords)
+        searchable = [req for req in requirements if req.lower() in analyzer_skills]
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide a job_description or a list of skills"
+        )
+    
+    skill_ids = await db.run_sync(skill_vocabulary.skill_ids, searchable)
+    if not skill_ids:
+        return []
+    
+    # Postings written under an older vocabulary are rebuilt before searching
+    await db.run_sync(skill_vocabulary.refresh_user, user_id)
+    ranked = await db.run_sync(skill_vocabulary.search, user_id, skill_ids, search.top_k, search.require_all)
+    if not ranked:
+        return []
+    
+    resume_ids = [resume_id for resume_id, _ in ranked]
+    filenames = dict((await db.execute(select(Resume.id, Resume.filename).where(Resume.id.in_(resume_ids)))).all())
+    matched = await db.run_sync(skill_vocabulary.matched_skills, resume_ids, skill_ids)
+    
+    results = []
+    for resume_id, _ in ranked:
+        resume_skills = [req for req in requirements if req.lower() in matched[resume_id]]
+        match = analyzer.score_skill_match(resume_skills, requirements)
+        results.append({
+            "resume_id": resume_id,
+            "filename": filenames[resume_id],
+            "match_score": match["match_score"],
+            "matching_skills": match["matching_skills"],
+            "missing_skills": match["missing_skills"]
+        })
+    return FastJSONResponse(results)
+
+@router.post("/semantic-search", response_model=List[SimilarResume])
+async def semantic_search(
+    search: SemanticSearch,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Top-k of the user's resumes closest to a job description, by embedding similarity"""
+    query = embedder.embed(search.job_description)
+    ranked = await asyncio.to_thread(similarity_search.search, query, user_id, search.top_k)
+    return FastJSONResponse(await similar_resumes(db, ranked))
 
 @router.post("/match/{resume_id}", response_model=JobMatchResponse)
 async def match_with_job_description(
     resume_id: int,
     job_data: JobMatchCreate,
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
-    user_id = await get_current_user_id(credentials, db)
-    
     # Get resume
-    resume = db.query(Resume).filter(
+    resume = await db.scalar(select(Resume).where(
         Resume.id == resume_id,
         Resume.user_id == user_id
-    ).first()
+    ))
     
     if not resume:
         raise HTTPException(
@@ -38,27 +267,35 @@ async def match_with_job_description(
     
     try:
         # Compare resume with job description
-        match_analysis = analyzer.compare_with_job_description(
-            resume.resume_text, 
-            job_data.job_description
-        )
-        
-        # Save job match results
-        job_match = JobMatch(
-            resume_id=resume_id,
-            job_description=job_data.job_description,
-            job_title=job_data.job_title,
-            match_score=match_analysis["match_score"],
-            missing_skills=json.dumps(match_analysis["missing_skills"]),
-            overlapping_skills=json.dumps(match_analysis["overlapping_skills"]),
-            suggestions=json.dumps(match_analysis["suggestions"])
-        )
+        with metrics.span("job_match_scoring_seconds", mode="single"):
+            resume_skills = analyzer.skills_from_vocabulary(await db.run_sync(skill_vocabulary.resume_skills, resume))
+            similarity = (await db.run_sync(tfidf_matcher.similarities, job_data.job_description, [resume]))[0]
+            match_analysis = analyzer.compare_with_job_description(
+                resume.resume_text, 
+                job_data.job_description,
+                resume_skills,
+                similarity
+            )
+        await db.commit()  # a refreshed skill vector must not hold the write lock below
         
-        db.add(job_match)
-        db.commit()
-        db.refresh(job_match)
+        def save_job_match(session):
+            job_match = JobMatch(
+                resume_id=resume_id,
+                job_description=job_data.job_description,
+                job_title=job_data.job_title,
+                match_score=match_analysis["match_score"],
+                text_similarity=match_analysis["text_similarity"],
+                missing_skills=match_analysis["missing_skills"],
+                overlapping_skills=match_analysis["overlapping_skills"],
+                suggestions=match_analysis["suggestions"]
+            )
+            session.add(job_match)
+            session.flush()
+            session.refresh(job_match)
+            return job_match
         
-        return job_match
+        # Save job match results
+        return await write_batcher.run(save_job_match)
         
     except Exception as e:
         raise HTTPException(
@@ -66,64 +303,60 @@ async def match_with_job_description(
             detail=f"Error matching with job description: {str(e)}"
         )
 
-@router.get("/{resume_id}/matches", response_model=List[JobMatchResponse])
+@router.get("/{resume_id}/matches", response_model=List[JobMatchSummary])
 async def get_job_matches(
     resume_id: int,
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    include_description: bool = False,
+    filters: MatchFilters = Depends(),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
-    user_id = await get_current_user_id(credentials, db)
-    
-    # Verify resume ownership
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == user_id
-    ).first()
-    
-    if not resume:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
-        )
+    """A page of a resume's job matches, newest first (next page cursor in X-Next-Cursor)"""
+    # Get job matches for this resume
+    query = filters.apply(_user_matches_query(user_id, include_description).where(JobMatch.resume_id == resume_id))
+    matches, next_cursor = await keyset_page(db, query, JobMatch.id, cursor, limit)
     
-    # Get all job matches for this resume
-    matches = db.query(JobMatch).filter(
-        JobMatch.resume_id == resume_id
-    ).order_by(JobMatch.created_at.desc()).all()
+    # An empty page is either a resume without matches or one the user does not own
+    if not matches:
+        resume_found = await db.scalar(select(Resume.id).where(
+            Resume.id == resume_id,
+            Resume.user_id == user_id
+        ))
+        if not resume_found:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Resume not found"
+            )
     
-    return matches
+    return page_response(matches, next_cursor)
 
-@router.get("/matches", response_model=List[JobMatchResponse])
+@router.get("/matches", response_model=List[JobMatchSummary])
 async def get_all_job_matches(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    include_description: bool = False,
+    filters: MatchFilters = Depends(),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
-    user_id = await get_current_user_id(credentials, db)
-    
-    # Get all resumes for this user
-    user_resumes = db.query(Resume).filter(Resume.user_id == user_id).all()
-    resume_ids = [resume.id for resume in user_resumes]
-    
-    # Get all job matches for user's resumes
-    matches = db.query(JobMatch).filter(
-        JobMatch.resume_id.in_(resume_ids)
-    ).order_by(JobMatch.created_at.desc()).all()
-    
-    return matches
+    """A page of job matches across all the user's resumes, newest first"""
+    # Get job matches for user's resumes
+    query = filters.apply(_user_matches_query(user_id, include_description))
+    return page_response(*await keyset_page(db, query, JobMatch.id, cursor, limit))
 
 @router.get("/match/{match_id}", response_model=JobMatchResponse)
 async def get_job_match_details(
     match_id: int,
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
-    user_id = await get_current_user_id(credentials, db)
-    
     # Get job match and verify ownership
-    match = db.query(JobMatch).join(Resume).filter(
+    match = await db.scalar(select(JobMatch).join(Resume).where(
         JobMatch.id == match_id,
         Resume.user_id == user_id
-    ).first()
+    ))
     
     if not match:
         raise HTTPException(
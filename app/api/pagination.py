@@ -0,0 +1,42 @@
+from fastapi import HTTPException, status
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Tuple
+import base64
+from app.api.responses import FastJSONResponse, rows_response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{row_id}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        kind, row_id = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split(":")
+        if kind != "id":
+            raise ValueError(kind)
+        return int(row_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+async def keyset_page(db: AsyncSession, query: Select, id_column, cursor: Optional[str], limit: int) -> Tuple[list, Optional[str]]:
+    """One page of rows, newest (highest id) first, and the cursor of the next page if more rows remain.
+
+    Rows are ordered by id, which follows insertion time, so a page is a
+    single index range scan however much history precedes it.
+    """
+    if cursor:
+        query = query.where(id_column < decode_cursor(cursor))
+    rows = (await db.execute(query.order_by(id_column.desc()).limit(limit + 1))).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].id)
+    return rows, None
+
+def page_response(rows: list, next_cursor: Optional[str]) -> FastJSONResponse:
+    """A page as JSON, with the next page's cursor in the X-Next-Cursor header"""
+    return rows_response(rows, headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
@@ -0,0 +1,24 @@
+from fastapi.responses import ORJSONResponse
+from typing import Any, Dict, Iterable, Optional
+import orjson
+
+# UTC datetimes end in "Z", as they do in pydantic's JSON output
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+class FastJSONResponse(ORJSONResponse):
+    """App-wide default response class: orjson encodes the body in a single native pass"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+def rows_response(rows: Iterable, headers: Optional[Dict[str, str]] = None) -> FastJSONResponse:
+    """Serialize projected rows straight to JSON.
+
+    Returning a Response bypasses the route's response_model, so the rows are
+    not validated into pydantic models and dumped back to dicts; the query's
+    labelled columns must already match the documented schema.
+    """
+    return FastJSONResponse([dict(row._mapping) for row in rows], headers=headers)
+
+def ndjson_line(value: Any) -> bytes:
+    return orjson.dumps(value, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
@@ -1,65 +1,141 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from typing import List
-import json
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional, Tuple
+import asyncio
+import logging
+import zipfile
+from app.core.config import settings
+from app.core.database import get_db, AsyncSessionLocal
+from app.core.write_batcher import write_batcher
 from app.api.auth import get_current_user_id
-from app.models import Resume, AnalysisResult
-from app.schemas import ResumeResponse, AnalysisResultResponse
-from app.services.resume_parser import ResumeParser
-from app.services.ai_analyzer import AIAnalyzer
+from app.api.pagination import keyset_page, page_response
+from app.api.responses import FastJSONResponse, ndjson_line
+from app.models import Resume, AnalysisResult, AnalysisJob, JobMatch
+from app.schemas import ResumeResponse, AnalysisResultResponse, AnalysisJobResponse, SimilarResume
+from app.services.analysis_cache import ANALYSIS_VERSION, analysis_cache, analysis_cache_key
+from app.services.analysis_queue import analysis_queue, store_analysis
+from app.services.embeddings import embedder, embedding_store, similarity_search
+from app.services.extraction_pool import extraction_pool, ExtractionOverloaded, ExtractionTimeout
+from app.services.parse_cache import parse_cache, parse_cache_key
+from app.services.skill_vectors import skill_vocabulary
+from app.services.tfidf import TfidfMatcher, term_counts
+from app.services.upload_ingest import IngestedUpload, UploadTooLarge, ingest_stream, ingest_upload
 
 router = APIRouter()
-security = HTTPBearer()
+logger = logging.getLogger(__name__)
+
+async def _ingest(file: UploadFile) -> IngestedUpload:
+    try:
+        return await ingest_upload(
+            file,
+            max_bytes=settings.MAX_UPLOAD_BYTES,
+            spool_threshold=settings.UPLOAD_SPOOL_THRESHOLD_BYTES,
+            chunk_size=settings.UPLOAD_CHUNK_BYTES
+        )
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds the {settings.MAX_UPLOAD_BYTES} byte upload limit"
+        )
+
+def _job_query():
+    # Jobs are returned with their result, which cannot be lazy-loaded in async code
+    return select(AnalysisJob).options(selectinload(AnalysisJob.result))
+
+def _resume_file_type(filename: str):
+    filename = filename.lower()
+    if filename.endswith('.pdf'):
+        return "pdf"
+    if filename.endswith('.docx'):
+        return "docx"
+    return None
+
+async def _parse_upload(file_type: str, upload: IngestedUpload):
+    """Return (resume_text, parsed_data), reusing the cached parse of identical files"""
+    cache_key = parse_cache_key(file_type, upload.sha256)
+    cached = await asyncio.to_thread(parse_cache.get, cache_key)
+    if cached is not None:
+        return cached["resume_text"], cached["parsed_data"]
+    
+    # Extract and parse in a worker process so the event loop stays free
+    resume_text, parsed_data = await extraction_pool.extract(file_type, upload.source)
+    
+    await asyncio.to_thread(parse_cache.put, cache_key, {"resume_text": resume_text, "parsed_data": parsed_data})
+    return resume_text, parsed_data
+
+async def _extract_resume(file_type: str, upload: IngestedUpload):
+    """Parse an upload, translating extraction failures into HTTP errors"""
+    try:
+        return await _parse_upload(file_type, upload)
+    except ExtractionOverloaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Resume parser is busy, please retry shortly",
+            headers={"Retry-After": str(settings.EXTRACTION_RETRY_AFTER_SECONDS)}
+        )
+    except ExtractionTimeout:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Timed out processing resume"
+        )
+    except Exception as e:
+        print(f"Error processing resume: {str(e)}")  # Debug logging
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing resume: {str(e)}"
+        )
 
 @router.post("/upload", response_model=ResumeResponse)
 async def upload_resume(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    user_id: int = Depends(get_current_user_id),
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    user_id = await get_current_user_id(credentials, db)
-    
     # Check file type - be more lenient
-    filename = file.filename.lower()
-    if not (filename.endswith('.pdf') or filename.endswith('.docx')):
+    file_type = _resume_file_type(file.filename)
+    if file_type is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only PDF and DOCX files are supported"
         )
     
-    # Determine file type
-    file_type = "pdf" if filename.endswith('.pdf') else "docx"
-    
-    # Read file content
-    file_content = await file.read()
+    # Stream the file into a single size-bounded buffer
+    upload = await _ingest(file)
     
     # Parse resume
-    parser = ResumeParser()
+    try:
+        resume_text, parsed_data = await _extract_resume(file_type, upload)
+    finally:
+        upload.close()
     
     try:
-        if file_type == "pdf":
-            resume_text = parser.extract_text_from_pdf(file_content)
-        else:
-            resume_text = parser.extract_text_from_docx(file_content)
-        
-        # Parse structured data
-        parsed_data = parser.parse_resume_text(resume_text)
-        
-        # Save to database
-        resume = Resume(
-            user_id=user_id,
-            filename=file.filename,
-            file_type=file_type,
-            resume_text=resume_text,
-            parsed_data=json.dumps(parsed_data)
-        )
+        skill_bits = await db.run_sync(skill_vocabulary.encode, resume_text)
+        counts = term_counts(resume_text)
         
-        db.add(resume)
-        db.commit()
-        db.refresh(resume)
+        def save_resume(session):
+            resume = Resume(
+                user_id=user_id,
+                filename=file.filename,
+                file_type=file_type,
+                resume_text=resume_text,
+                parsed_data=parsed_data,
+                skill_bits=skill_bits,
+                skill_vocab_version=skill_vocabulary.version,
+                term_counts=counts,
+                term_counts_version=TfidfMatcher.VERSION
+            )
+            session.add(resume)
+            session.flush()
+            skill_vocabulary.index_resume(session, user_id, resume.id, skill_bits)
+            session.refresh(resume)
+            return resume
         
+        # Save to database (coalesced with concurrent uploads when batching is on)
+        resume = await write_batcher.run(save_resume)
+        await _embed_resumes([(resume.id, user_id, resume_text)])
         return resume
         
     except Exception as e:
@@ -69,101 +145,346 @@ async def upload_resume(
             detail=f"Error processing resume: {str(e)}"
         )
 
-@router.post("/analyze/{resume_id}", response_model=AnalysisResultResponse)
+async def _embed_resumes(items: List[Tuple[int, int, str]]):
+    """Add (resume_id, user_id, resume_text) to the similarity index; the background sync retries failures"""
+    try:
+        await asyncio.to_thread(similarity_search.add, items)
+    except Exception:
+        logger.exception("Error embedding resumes %s", [item[0] for item in items])
+
+def _archive_members(archive: zipfile.ZipFile) -> list:
+    return [
+        member for member in archive.infolist()
+        if not member.is_dir() and not member.filename.startswith('__MACOSX/')
+    ]
+
+def _ingest_member(archive: zipfile.ZipFile, member: zipfile.ZipInfo) -> IngestedUpload:
+    """Decompress an archive member under the upload size bound (blocking)"""
+    with archive.open(member) as stream:
+        return ingest_stream(
+            stream,
+            max_bytes=settings.MAX_UPLOAD_BYTES,
+            spool_threshold=settings.UPLOAD_SPOOL_THRESHOLD_BYTES,
+            chunk_size=settings.UPLOAD_CHUNK_BYTES
+        )
+
+async def _collect_batch_documents(files: List[UploadFile]) -> Tuple[list, list]:
+    """Split a batch upload into parseable documents and per-file errors.
+    
+    Zip archives are expanded into their PDF and DOCX members. The file count
+    and the archives' declared uncompressed size are checked before anything
+    is read; members are then decompressed off the event loop.
+    """
+    documents, errors = [], []
+    
+    def add_error(filename: str, error: str):
+        errors.append({"index": len(documents) + len(errors), "filename": filename, "status": "failed", "error": error})
+    
+    # Size the batch from the zip directories first, so oversized batches are rejected without reading them
+    archives = {}
+    try:
+        file_count, uncompressed_bytes = 0, 0
+        for position, file in enumerate(files):
+            if file.filename.lower().endswith('.zip'):
+                try:
+                    archive = await asyncio.to_thread(zipfile.ZipFile, file.file)
+                except zipfile.BadZipFile:
+                    file_count += 1
+                    continue
+                archives[position] = archive
+                members = _archive_members(archive)
+                file_count += len(members)
+                uncompressed_bytes += sum(member.file_size for member in members)
+            else:
+                file_count += 1
+        
+        if file_count > settings.MAX_BATCH_FILES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"A batch may contain at most {settings.MAX_BATCH_FILES} files"
+            )
+        if uncompressed_bytes > settings.MAX_BATCH_UNCOMPRESSED_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Zip archives expand beyond the {settings.MAX_BATCH_UNCOMPRESSED_BYTES} byte batch limit"
+            )
+        
+        for position, file in enumerate(files):
+            if file.filename.lower().endswith('.zip'):
+                archive = archives.get(position)
+                if archive is None:
+                    add_error(file.filename, "Invalid zip archive")
+                    continue
+                for member in _archive_members(archive):
+                    file_type = _resume_file_type(member.filename)
+                    if file_type is None:
+                        add_error(member.filename, "Only PDF and DOCX files are supported")
+                        continue
+                    if member.file_size > settings.MAX_UPLOAD_BYTES:
+                        add_error(member.filename, f"File exceeds the {settings.MAX_UPLOAD_BYTES} byte upload limit")
+                        continue
+                    try:
+                        upload = await asyncio.to_thread(_ingest_member, archive, member)
+                    except UploadTooLarge:
+                        add_error(member.filename, f"File exceeds the {settings.MAX_UPLOAD_BYTES} byte upload limit")
+                        continue
+                    except Exception as e:
+                        add_error(member.filename, f"Could not read archive member: {str(e)}")
+                        continue
+                    documents.append((len(documents) + len(errors), member.filename, file_type, upload))
+                continue
+            
+            file_type = _resume_file_type(file.filename)
+            if file_type is None:
+                add_error(file.filename, "Only PDF and DOCX files are supported")
+                continue
+            try:
+                upload = await _ingest(file)
+            except HTTPException as e:
+                add_error(file.filename, e.detail)
+                continue
+            documents.append((len(documents) + len(errors), file.filename, file_type, upload))
+    except BaseException:
+        for _, _, _, upload in documents:
+            upload.close()
+        raise
+    finally:
+        for archive in archives.values():
+            archive.close()
+    
+    return documents, errors
+
+@router.post("/upload/batch")
+async def upload_resumes_batch(
+    user_id: int = Depends(get_current_user_id),
+    files: List[UploadFile] = File(...),
+    db: AsyncSession = Depends(get_db)
+):
+    """Upload many resumes (or zip archives of them), streaming NDJSON results.
+    
+    One line is emitted per file as soon as it is parsed or fails, then all
+    parsed resumes are inserted in a single transaction and a final
+    ``committed`` line lists the created resumes.
+    """
+    documents, errors = await _collect_batch_documents(files)
+    
+    # Keep the batch within the pool's capacity so it does not starve single uploads
+    slots = asyncio.Semaphore(extraction_pool.max_workers)
+    
+    async def parse(index: int, filename: str, file_type: str, upload: IngestedUpload):
+        async with slots:
+            try:
+                while True:
+                    try:
+                        resume_text, parsed_data = await _parse_upload(file_type, upload)
+                        break
+                    except ExtractionOverloaded:
+                        await asyncio.sleep(0.1)
+            except ExtractionTimeout:
+                return index, filename, file_type, None, "Timed out processing resume"
+            except Exception as e:
+                return index, filename, file_type, None, f"Error processing resume: {str(e)}"
+            finally:
+                upload.close()
+        return index, filename, file_type, (resume_text, parsed_data), None
+    
+    async def results():
+        tasks = [asyncio.ensure_future(parse(*document)) for document in documents]
+        rows, indexes = [], []
+        try:
+            for error in errors:
+                yield ndjson_line(error)
+            
+            for next_result in asyncio.as_completed(tasks):
+                index, filename, file_type, parsed, error = await next_result
+                if error:
+                    yield ndjson_line({"index": index, "filename": filename, "status": "failed", "error": error})
+                    continue
+                
+                resume_text, parsed_data = parsed
+                rows.append({
+                    "user_id": user_id,
+                    "filename": filename,
+                    "file_type": file_type,
+                    "resume_text": resume_text,
+                    "parsed_data": parsed_data
+                })
+                indexes.append(index)
+                yield ndjson_line({"index": index, "filename": filename, "status": "parsed"})
+            
+            created = []
+            if rows:
+                # One bulk INSERT ... RETURNING and a single commit for the whole batch
+                async with AsyncSessionLocal() as batch_db:
+                    try:
+                        for row in rows:
+                            row["skill_bits"] = await batch_db.run_sync(skill_vocabulary.encode, row["resume_text"])
+                            row["skill_vocab_version"] = skill_vocabulary.version
+                            row["term_counts"] = term_counts(row["resume_text"])
+                            row["term_counts_version"] = TfidfMatcher.VERSION
+                        inserted = (await batch_db.execute(
+                            insert(Resume).returning(
+                                Resume.id, Resume.user_id, Resume.filename, Resume.file_type, Resume.uploaded_at,
+                                sort_by_parameter_order=True
+                            ),
+                            rows
+                        )).all()
+                        for row, resume in zip(rows, inserted):
+                            await batch_db.run_sync(skill_vocabulary.index_resume, user_id, resume.id, row["skill_bits"])
+                        await batch_db.commit()
+                    except Exception as e:
+                        await batch_db.rollback()
+                        yield ndjson_line({"status": "rolled_back", "error": f"Error saving resumes: {str(e)}"})
+                        return
+                
+                await _embed_resumes([(resume.id, user_id, row["resume_text"]) for row, resume in zip(rows, inserted)])
+                
+                # The RETURNING columns are exactly ResumeResponse's fields
+                created = [{"index": index, **row._mapping} for index, row in zip(indexes, inserted)]
+            
+            yield ndjson_line({"status": "committed", "resumes": created})
+        finally:
+            # Client went away or the batch failed; stop parsing and drop spooled files
+            for task in tasks:
+                task.cancel()
+            for _, _, _, upload in documents:
+                upload.close()
+    
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@router.post("/analyze/{resume_id}", response_model=AnalysisJobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def analyze_resume(
     resume_id: int,
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
-    user_id = await get_current_user_id(credentials, db)
-    
     # Get resume
-    resume = db.query(Resume).filter(
+    resume_found = await db.scalar(select(Resume.id).where(
         Resume.id == resume_id,
         Resume.user_id == user_id
-    ).first()
+    ))
     
-    if not resume:
+    if not resume_found:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resume not found"
         )
     
-    # Check if already analyzed
-    existing_analysis = db.query(AnalysisResult).filter(
-        AnalysisResult.resume_id == resume_id
-    ).first()
+    # Reuse a job that is still queued or running
+    active_job = await db.scalar(_job_query().where(
+        AnalysisJob.resume_id == resume_id,
+        AnalysisJob.status.in_(["pending", "running"])
+    ).limit(1))
     
-    if existing_analysis:
-        return existing_analysis
+    if active_job:
+        return active_job
     
-    # Perform AI analysis
-    analyzer = AIAnalyzer()
+    # Check if already analyzed; results from an older analyzer or vocabulary are redone
+    existing_analysis = await db.scalar(select(AnalysisResult).where(
+        AnalysisResult.resume_id == resume_id
+    ).limit(1))
     
-    try:
-        parsed_data = json.loads(resume.parsed_data) if resume.parsed_data else {}
-        
-        # Analyze resume
-        analysis = analyzer.analyze_resume(resume.resume_text, parsed_data)
+    if existing_analysis and existing_analysis.analyzer_version == ANALYSIS_VERSION:
+        done_job = await db.scalar(_job_query().where(
+            AnalysisJob.analysis_result_id == existing_analysis.id,
+            AnalysisJob.status == "done"
+        ).order_by(AnalysisJob.id.desc()).limit(1))
+        if done_job:
+            return done_job
         
-        # Save analysis results
-        analysis_result = AnalysisResult(
+        # Analyzed before jobs existed; record it as a finished job
+        job = AnalysisJob(
             resume_id=resume_id,
-            ats_score=analysis["ats_score"],
-            skills=json.dumps(analysis["skills"]),
-            feedback=json.dumps(analysis["feedback"]),
-            suggestions=json.dumps(analysis["suggestions"]),
-            grammar_score=analysis.get("grammar_score"),
-            formatting_score=analysis.get("formatting_score"),
-            keyword_score=analysis.get("keyword_score")
+            status="done",
+            analysis_result_id=existing_analysis.id,
+            started_at=existing_analysis.analyzed_at,
+            finished_at=existing_analysis.analyzed_at
         )
+        db.add(job)
+        await db.commit()
+        return await db.scalar(_job_query().where(AnalysisJob.id == job.id))
+    
+    # Identical content was analyzed before (possibly for another user); finish the job now
+    resume_text = await db.scalar(select(Resume.resume_text).where(Resume.id == resume_id))
+    cached_analysis = await asyncio.to_thread(analysis_cache.get, analysis_cache_key(resume_text))
+    if cached_analysis is not None:
+        await db.commit()  # end the read snapshot so the job written below is visible
         
-        db.add(analysis_result)
-        db.commit()
-        db.refresh(analysis_result)
-        
-        return analysis_result
+        def save_cached_analysis(session):
+            job = AnalysisJob(resume_id=resume_id, status="running", started_at=func.now())
+            session.add(job)
+            session.flush()
+            store_analysis(session, job.id, resume_id, cached_analysis)
+            return job.id
         
-    except Exception as e:
+        job_id = await write_batcher.run(save_cached_analysis)
+        return await db.scalar(_job_query().where(AnalysisJob.id == job_id))
+    
+    # Queue the analysis and return immediately
+    job = AnalysisJob(resume_id=resume_id, status="pending")
+    db.add(job)
+    await db.commit()
+    
+    analysis_queue.enqueue(job.id)
+    
+    return await db.scalar(_job_query().where(AnalysisJob.id == job.id))
+
+@router.get("/analysis-jobs/{job_id}", response_model=AnalysisJobResponse)
+async def get_analysis_job(
+    job_id: int,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    # Get job and verify ownership
+    job = await db.scalar(_job_query().join(Resume).where(
+        AnalysisJob.id == job_id,
+        Resume.user_id == user_id
+    ))
+    
+    if not job:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error analyzing resume: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis job not found"
         )
+    
+    return job
 
 @router.get("/", response_model=List[ResumeResponse])
 async def get_user_resumes(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
-    user_id = await get_current_user_id(credentials, db)
-    
-    resumes = db.query(Resume).filter(Resume.user_id == user_id).all()
-    return resumes
+    """A page of the user's resumes, newest first (next page cursor in X-Next-Cursor)"""
+    # Only the listed columns; resume_text and parsed_data stay in the database
+    query = select(
+        Resume.id, Resume.user_id, Resume.filename, Resume.file_type, Resume.uploaded_at
+    ).where(Resume.user_id == user_id)
+    return page_response(*await keyset_page(db, query, Resume.id, cursor, limit))
 
 @router.get("/{resume_id}/analysis", response_model=AnalysisResultResponse)
 async def get_resume_analysis(
     resume_id: int,
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
 ):
-    user_id = await get_current_user_id(credentials, db)
-    
     # Verify resume ownership
-    resume = db.query(Resume).filter(
+    resume_found = await db.scalar(select(Resume.id).where(
         Resume.id == resume_id,
         Resume.user_id == user_id
-    ).first()
+    ))
     
-    if not resume:
+    if not resume_found:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resume not found"
         )
     
     # Get analysis
-    analysis = db.query(AnalysisResult).filter(
+    analysis = await db.scalar(select(AnalysisResult).where(
         AnalysisResult.resume_id == resume_id
-    ).first()
+    ).limit(1))
     
     if not analysis:
         raise HTTPException(
@@ -172,3 +493,69 @@ async def get_resume_analysis(
         )
     
     return analysis
+
+@router.get("/{resume_id}/similar", response_model=List[SimilarResume])
+async def get_similar_resumes(
+    resume_id: int,
+    top_k: int = Query(10, ge=1, le=100),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """The user's other resumes closest to this one, by embedding similarity"""
+    resume_found = await db.scalar(select(Resume.id).where(
+        Resume.id == resume_id,
+        Resume.user_id == user_id
+    ))
+    
+    if not resume_found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    # Embed on the fly if the store has not caught up with this resume yet
+    query = embedding_store.vector(resume_id)
+    if query is None:
+        query = embedder.embed(await db.scalar(select(Resume.resume_text).where(Resume.id == resume_id)))
+    
+    ranked = await asyncio.to_thread(similarity_search.search, query, user_id, top_k, resume_id)
+    return FastJSONResponse(await similar_resumes(db, ranked))
+
+async def similar_resumes(db: AsyncSession, ranked: List[Tuple[int, float]]) -> List[dict]:
+    """SimilarResume dicts for ranked (resume_id, similarity) pairs, skipping resumes deleted meanwhile"""
+    if not ranked:
+        return []
+    filenames = dict((await db.execute(
+        select(Resume.id, Resume.filename).where(Resume.id.in_([resume_id for resume_id, _ in ranked]))
+    )).all())
+    return [
+        {"resume_id": resume_id, "filename": filenames[resume_id], "similarity": round(similarity, 4)}
+        for resume_id, similarity in ranked if resume_id in filenames
+    ]
+
+@router.delete("/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_resume(
+    resume_id: int,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    # Verify resume ownership
+    resume_found = await db.scalar(select(Resume.id).where(
+        Resume.id == resume_id,
+        Resume.user_id == user_id
+    ))
+    
+    if not resume_found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    # Remove the resume with everything derived from it
+    await db.run_sync(skill_vocabulary.unindex_resume, resume_id)
+    await db.execute(delete(AnalysisJob).where(AnalysisJob.resume_id == resume_id))
+    await db.execute(delete(AnalysisResult).where(AnalysisResult.resume_id == resume_id))
+    await db.execute(delete(JobMatch).where(JobMatch.resume_id == resume_id))
+    await db.execute(delete(Resume).where(Resume.id == resume_id))
+    await db.commit()
+    embedding_store.remove(resume_id)
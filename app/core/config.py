@@ -4,11 +4,32 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./resume_analyzer.db"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    
+    # SQLite performance mode: WAL, tuned pragmas and coalesced inserts (sqlite URLs only)
+    SQLITE_PERFORMANCE_MODE: bool = False
+    SQLITE_MMAP_SIZE_BYTES: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_WRITE_BATCH_MAX: int = 64
+    SQLITE_WRITE_BATCH_WINDOW_MS: float = 0.0
     
     # JWT
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_DEPTH: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
     
     # OpenAI
     OPENAI_API_KEY: Optional[str] = None
@@ -18,6 +39,60 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     DEBUG: bool = True
     
+    # Resume text extraction
+    EXTRACTION_WORKERS: Optional[int] = None  # defaults to the CPU count
+    EXTRACTION_QUEUE_DEPTH: int = 32
+    EXTRACTION_TIMEOUT_SECONDS: float = 30.0
+    EXTRACTION_RETRY_AFTER_SECONDS: int = 5
+    
+    # Uploads
+    MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_SPOOL_THRESHOLD_BYTES: int = 1024 * 1024
+    UPLOAD_CHUNK_BYTES: int = 64 * 1024
+    MAX_BATCH_FILES: int = 500
+    MAX_BATCH_UNCOMPRESSED_BYTES: int = 200 * 1024 * 1024  # everything the zip archives of one batch expand to
+    
+    # List endpoints (keyset pagination)
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+    
+    # Background analysis
+    ANALYSIS_WORKERS: int = 2
+    ANALYSIS_LEASE_SECONDS: int = 300  # renewed while a job runs; expired running jobs are reclaimed
+    
+    # Background re-scoring of analyses made by an older analyzer or vocabulary
+    RESCORE_ON_STARTUP: bool = True
+    RESCORE_CHUNK_SIZE: int = 100
+    RESCORE_DUTY_CYCLE: float = 0.2  # share of wall time spent re-scoring; the rest is left to live traffic
+    
+    # Parse cache (content-addressed; set PARSE_CACHE_PATH empty for memory only)
+    PARSE_CACHE_MEMORY_ENTRIES: int = 256
+    PARSE_CACHE_PATH: Optional[str] = "./parse_cache.db"
+    PARSE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    
+    # Analysis cache (keyed by resume text hash and analyzer version; set ANALYSIS_CACHE_PATH empty for memory only)
+    ANALYSIS_CACHE_MEMORY_ENTRIES: int = 1024
+    ANALYSIS_CACHE_PATH: Optional[str] = "./analysis_cache.db"
+    ANALYSIS_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    
+    # TF-IDF job matching
+    CORPUS_IDF_TTL_SECONDS: float = 300.0
+    MATCH_RANK_TEXT_WEIGHT: float = 0.3  # share of the /match/batch ranking taken by text similarity
+    CORPUS_REBUILD_INTERVAL_SECONDS: float = 3600.0
+    CORPUS_REBUILD_CHANGE_RATIO: float = 0.1  # rebuild once the resume count moves this much from the snapshot
+    CORPUS_REBUILD_MIN_CHANGE: int = 50
+    
+    # Resume embeddings and similarity search (set EMBEDDING_STORE_PATH empty to keep vectors in memory)
+    EMBEDDING_STORE_PATH: Optional[str] = "./embeddings"
+    EMBEDDING_DIMENSIONS: int = 256
+    EMBEDDING_IVF_PROBES: int = 16
+    EMBEDDING_EXACT_SEARCH_MAX_ROWS: int = 10000  # users with more resumes are searched through the IVF index
+    EMBEDDING_SYNC_INTERVAL_SECONDS: float = 300.0
+    
+    # Request and hot-path latency metrics, served at /metrics in the Prometheus format
+    METRICS_ENABLED: bool = True
+    METRICS_WINDOW_SIZE: int = 1024  # recent samples per series behind the p50/p95/p99 gauges
+    
     # CORS
     ALLOWED_ORIGINS: list = [
         "http://localhost:3000", 
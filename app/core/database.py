@@ -1,16 +1,119 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from .config import settings
+from .json_types import dumps, loads
+from .metrics import metrics
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async drivers for the sync URLs accepted in DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg"
+}
+
+def async_database_url(database_url: str) -> str:
+    """The DATABASE_URL rewritten to use an asyncio driver"""
+    url = make_url(database_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername)).render_as_string(hide_password=False)
+
+def pool_options(database_url: str, poolclass) -> dict:
+    """Connection pool settings for an engine (in-memory SQLite has a single connection)"""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    }
+
+def sqlite_performance_mode(database_url: str) -> bool:
+    """Whether the SQLite tuning pragmas and write batching apply to this database"""
+    url = make_url(database_url)
+    return (
+        settings.SQLITE_PERFORMANCE_MODE
+        and url.get_backend_name() == "sqlite"
+        and url.database not in (None, "", ":memory:")
+    )
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers proceed during a write, and NORMAL sync only fsyncs at checkpoints
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE_BYTES)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def begin_immediate_transactions(engine):
+    """Open every transaction on a pysqlite engine with BEGIN IMMEDIATE.
+
+    pysqlite normally defers BEGIN until the first write and commits on its
+    own when a SAVEPOINT is released outside a transaction. With its handling
+    off, SQLAlchemy's begin event starts a real transaction that holds the
+    write lock from the start, so SAVEPOINTs nest inside it.
+    """
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+class TimedSession(Session):
+    """Session whose commits are timed into the db_commit_seconds histogram (AsyncSession commits included)"""
+    
+    def commit(self):
+        with metrics.span("db_commit_seconds"):
+            super().commit()
+
+# Sync engine for background worker threads, table creation and scripts
+engine = create_engine(
+    settings.DATABASE_URL,
+    json_serializer=dumps,
+    json_deserializer=loads,
+    **pool_options(settings.DATABASE_URL, QueuePool)
+)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=TimedSession)
+
+# Async engine for request handlers, so DB round trips never block the event loop
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    json_serializer=dumps,
+    json_deserializer=loads,
+    **pool_options(settings.DATABASE_URL, AsyncAdaptedQueuePool)
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False, sync_session_class=TimedSession)
+
+# Engine of the SQLite write batcher: one writer whose batches take the write lock up front
+batch_engine = engine
+if sqlite_performance_mode(settings.DATABASE_URL):
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+    batch_engine = create_engine(
+        settings.DATABASE_URL,
+        json_serializer=dumps,
+        json_deserializer=loads,
+        pool_size=1,
+        max_overflow=0
+    )
+    event.listen(batch_engine, "connect", apply_sqlite_pragmas)
+    begin_immediate_transactions(batch_engine)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
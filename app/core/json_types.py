@@ -0,0 +1,49 @@
+from typing import Any
+import orjson
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import Boolean
+
+# JSON stored natively: JSON1 text on SQLite, binary JSONB on PostgreSQL
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+def dumps(value: Any) -> str:
+    """orjson-backed replacement for json.dumps, used by the engines for JSON columns"""
+    return orjson.dumps(value).decode("utf-8")
+
+
+def loads(value) -> Any:
+    return orjson.loads(value)
+
+
+class json_array_contains(FunctionElement):
+    """SQL test for a JSON array column holding a string, compared case-insensitively.
+
+    Runs entirely in the database (json_each on SQLite,
+    jsonb_array_elements_text on PostgreSQL), so rows are filtered without
+    deserializing them in Python.
+    """
+    type = Boolean()
+    inherit_cache = True
+    name = "json_array_contains"
+
+
+@compiles(json_array_contains, "sqlite")
+def _sqlite_json_array_contains(element, compiler, **kw):
+    column, value = list(element.clauses)
+    return (
+        f"EXISTS (SELECT 1 FROM json_each({compiler.process(column, **kw)}) AS element "
+        f"WHERE lower(element.value) = lower({compiler.process(value, **kw)}))"
+    )
+
+
+@compiles(json_array_contains, "postgresql")
+def _postgresql_json_array_contains(element, compiler, **kw):
+    column, value = list(element.clauses)
+    return (
+        f"EXISTS (SELECT 1 FROM jsonb_array_elements_text({compiler.process(column, **kw)}) AS element "
+        f"WHERE lower(element) = lower({compiler.process(value, **kw)}))"
+    )
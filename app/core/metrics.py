@@ -0,0 +1,222 @@
+import bisect
+import functools
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Sequence, Tuple
+from .config import settings
+
+# Upper bounds (seconds) of the latency buckets, from sub-millisecond lookups to slow document parses
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+DESCRIPTIONS = {
+    "http_request_duration_seconds": "HTTP request latency by route template, method and status",
+    "resume_extract_seconds": "ResumeParser.extract_text_from_* time per document, inside the extraction workers",
+    "resume_parse_seconds": "ResumeParser.parse_resume_text time per document, inside the extraction workers",
+    "resume_extract_bytes_total": "Document bytes run through text extraction",
+    "resume_extract_throughput_bytes_per_second": "Document bytes extracted per second of extraction time",
+    "resume_analysis_seconds": "AIAnalyzer.analyze_resume time",
+    "job_match_scoring_seconds": "Time scoring resumes against a job description",
+    "job_match_seconds": "AIAnalyzer.compare_with_job_description time (requirement extraction and scoring of one resume)",
+    "jwt_decode_seconds": "JWT signature and expiry verification time",
+    "db_commit_seconds": "Database transaction commit time",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Histogram:
+    """Cumulative latency buckets of one labelled series, plus its most recent samples for quantiles"""
+
+    def __init__(self, buckets: Sequence[float], window: int):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.recent: deque = deque(maxlen=window)
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.recent.append(value)
+
+    def quantiles(self) -> Dict[float, float]:
+        """Nearest-rank quantiles of the recent samples"""
+        if not self.recent:
+            return {}
+        ordered = sorted(self.recent)
+        return {q: ordered[min(int(math.ceil(q * len(ordered))) - 1, len(ordered) - 1)] for q in QUANTILES}
+
+
+class MetricsRegistry:
+    """In-process latency histograms and counters, rendered in the Prometheus text format.
+
+    Histograms keep cumulative buckets for aggregation across instances, and
+    the last ``window`` samples of each series for the p50/p95/p99 gauges.
+    Rates pair a counter with a histogram of the same labels and expose
+    counter / histogram sum, e.g. bytes per second of parsing.
+    """
+
+    def __init__(self, enabled: bool = True, window: int = 1024, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.enabled = enabled
+        self.window = window
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._rates: Dict[str, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, **labels):
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets, self.window)
+            histogram.observe(seconds)
+
+    def increment(self, name: str, amount: float = 1.0, **labels):
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def rate(self, name: str, counter: str, histogram: str):
+        """Expose ``counter`` divided by the summed time of ``histogram`` as the gauge ``name``"""
+        self._rates[name] = (counter, histogram)
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        """Time the enclosed block into the histogram ``name``, even if it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def timed(self, name: str, **labels) -> Callable:
+        """Decorator timing every call of a function into the histogram ``name``"""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name, **labels):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self) -> str:
+        """All series in the Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+
+        def header(name: str, kind: str, description: Optional[str] = None):
+            lines.append(f"# HELP {name} {description or DESCRIPTIONS.get(name, name)}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                header(name, "histogram")
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + (math.inf,), histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels, [('le', _format_value(bound))])} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+                header(f"{name}_quantile", "gauge", f"p50/p95/p99 of the last {self.window} samples of {name}")
+                for labels, histogram in sorted(series.items()):
+                    for q, value in histogram.quantiles().items():
+                        lines.append(f"{name}_quantile{_format_labels(labels, [('quantile', str(q))])} {_format_value(value)}")
+
+            for name, series in sorted(self._counters.items()):
+                header(name, "counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+            for name, (counter, histogram) in sorted(self._rates.items()):
+                totals = self._counters.get(counter, {})
+                durations = self._histograms.get(histogram, {})
+                header(name, "gauge")
+                for labels, value in sorted(totals.items()):
+                    seconds = durations[labels].sum if labels in durations else 0.0
+                    if seconds > 0:
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value / seconds)}")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by route template, method and status.
+
+    Plain ASGI rather than BaseHTTPMiddleware so streamed responses pass
+    through untouched; a request is timed until its last body chunk is sent.
+    """
+
+    def __init__(self, app, registry: "MetricsRegistry" = None):
+        self.app = app
+        self.registry = registry or metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router leaves the matched route in the scope; templates keep the label set small
+            route = scope.get("route")
+            self.registry.observe(
+                "http_request_duration_seconds",
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status_code
+            )
+
+
+metrics = MetricsRegistry(enabled=settings.METRICS_ENABLED, window=settings.METRICS_WINDOW_SIZE)
+metrics.rate("resume_extract_throughput_bytes_per_second", "resume_extract_bytes_total", "resume_extract_seconds")
@@ -0,0 +1,204 @@
+from typing import Callable, List, NamedTuple
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, inspect, insert, select, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import func
+from .database import Base, engine
+from .. import models  # noqa: F401  (registers every model on Base)
+
+# Applied migration versions; kept outside Base so create_all never touches it
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now())
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, name: str):
+    """Register an upgrade step; steps must be idempotent so partially migrated databases recover"""
+    def register(upgrade: Callable[[Connection], None]):
+        MIGRATIONS.append(Migration(version, name, upgrade))
+        return upgrade
+    return register
+
+
+def add_column_if_missing(conn: Connection, column: Column):
+    table = column.table.name
+    if column.name not in {existing["name"] for existing in inspect(conn).get_columns(table)}:
+        column_type = column.type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column.name} {column_type}"))
+
+
+def create_index_if_missing(conn: Connection, index: Index):
+    index.create(conn, checkfirst=True)
+
+
+def model_index(table: Table, name: str) -> Index:
+    return next(index for index in table.indexes if index.name == name)
+
+
+@migration(1, "initial schema")
+def create_tables(conn: Connection):
+    # Creates missing tables only; existing tables are upgraded by later steps
+    Base.metadata.create_all(conn)
+
+
+@migration(2, "resume skill vector columns")
+def add_skill_vector_columns(conn: Connection):
+    resumes = Base.metadata.tables["resumes"]
+    add_column_if_missing(conn, resumes.c.skill_bits)
+    add_column_if_missing(conn, resumes.c.skill_vocab_version)
+
+
+@migration(3, "indexes for hot foreign-key lookups")
+def add_lookup_indexes(conn: Connection):
+    tables = Base.metadata.tables
+
+    # Keep only the newest analysis of each resume before making resume_id unique
+    latest = "SELECT MAX(id) FROM analysis_results GROUP BY resume_id"
+    conn.execute(text(
+        "UPDATE analysis_jobs SET analysis_result_id = ("
+        "SELECT MAX(newest.id) FROM analysis_results newest WHERE newest.resume_id = ("
+        "SELECT old.resume_id FROM analysis_results old WHERE old.id = analysis_jobs.analysis_result_id)) "
+        f"WHERE analysis_result_id IS NOT NULL AND analysis_result_id NOT IN ({latest})"
+    ))
+    conn.execute(text(f"DELETE FROM analysis_results WHERE id NOT IN ({latest})"))
+
+    # The (user_id, uploaded_at) and (resume_id, created_at) indexes created here before migration 10 dropped them
+    create_index_if_missing(conn, model_index(tables["analysis_results"], "ux_analysis_results_resume_id"))
+
+
+@migration(4, "keyset pagination indexes")
+def add_pagination_indexes(conn: Connection):
+    tables = Base.metadata.tables
+    create_index_if_missing(conn, model_index(tables["resumes"], "ix_resumes_user_id_id"))
+    create_index_if_missing(conn, model_index(tables["job_matches"], "ix_job_matches_resume_id_id"))
+
+
+@migration(5, "native JSON columns")
+def convert_json_columns(conn: Connection):
+    # Columns that used to hold json.dumps output in Text
+    json_columns = {
+        "resumes": ["parsed_data"],
+        "analysis_results": ["skills", "feedback", "suggestions"],
+        "job_matches": ["missing_skills", "overlapping_skills", "suggestions"]
+    }
+    for table, columns in json_columns.items():
+        existing = {column["name"]: column["type"] for column in inspect(conn).get_columns(table)}
+        for column in columns:
+            if conn.dialect.name == "postgresql":
+                if not isinstance(existing[column], JSONB):
+                    conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb"))
+            elif conn.dialect.name == "sqlite":
+                # JSON1 reads the stored text as is; minify it and quote anything that is not valid JSON
+                conn.execute(text(
+                    f"UPDATE {table} SET {column} = CASE WHEN json_valid({column}) THEN json({column}) "
+                    f"ELSE json_quote({column}) END WHERE {column} IS NOT NULL"
+                ))
+
+
+@migration(6, "analysis result versions")
+def add_analysis_version_columns(conn: Connection):
+    # Existing results get NULL versions and are re-analyzed in full by the rescorer
+    analysis_results = Base.metadata.tables["analysis_results"]
+    add_column_if_missing(conn, analysis_results.c.analyzer_version)
+    add_column_if_missing(conn, analysis_results.c.vocabulary_versions)
+
+
+@migration(7, "TF-IDF term counts and corpus tables")
+def add_term_count_columns(conn: Connection):
+    tables = Base.metadata.tables
+    add_column_if_missing(conn, tables["resumes"].c.term_counts)
+    add_column_if_missing(conn, tables["resumes"].c.term_counts_version)
+    tables["corpus_terms"].create(conn, checkfirst=True)
+    tables["corpus_snapshots"].create(conn, checkfirst=True)
+
+
+@migration(8, "analysis job leases")
+def add_analysis_job_lease_column(conn: Connection):
+    # Running jobs without a lease count as expired and are retried once
+    add_column_if_missing(conn, Base.metadata.tables["analysis_jobs"].c.lease_expires_at)
+
+
+@migration(9, "skill postings for existing resumes")
+def backfill_skill_postings(conn: Connection):
+    # Resumes stored before the inverted index have skill bits but no postings;
+    # bit positions are skill ids, so the postings follow from the bits alone
+    resumes, postings = Base.metadata.tables["resumes"], Base.metadata.tables["skill_postings"]
+    unindexed = select(resumes.c.id, resumes.c.user_id, resumes.c.skill_bits).where(
+        resumes.c.skill_bits.is_not(None),
+        ~select(postings.c.resume_id).where(postings.c.resume_id == resumes.c.id).exists()
+    ).order_by(resumes.c.id).limit(1000)
+
+    last_id = 0
+    while True:
+        rows = conn.execute(unindexed.where(resumes.c.id > last_id)).all()
+        if not rows:
+            break
+        values = []
+        for resume_id, user_id, skill_bits in rows:
+            bits = int(skill_bits, 16)
+            values.extend(
+                {"user_id": user_id, "skill_id": skill_id, "resume_id": resume_id}
+                for skill_id in range(bits.bit_length()) if bits >> skill_id & 1
+            )
+        if values:
+            conn.execute(insert(postings), values)
+        last_id = rows[-1].id
+
+
+@migration(10, "drop timestamp-ordered list indexes")
+def drop_timestamp_list_indexes(conn: Connection):
+    # Lists paginate on (user_id, id) and (resume_id, id) since migration 4
+    conn.execute(text("DROP INDEX IF EXISTS ix_resumes_user_id_uploaded_at"))
+    conn.execute(text("DROP INDEX IF EXISTS ix_job_matches_resume_id_created_at"))
+
+
+@migration(11, "job match text similarity")
+def add_job_match_similarity_column(conn: Connection):
+    # Older matches keep a match_score that blended in text similarity, and no separate value
+    add_column_if_missing(conn, Base.metadata.tables["job_matches"].c.text_similarity)
+
+
+def applied_versions(bind: Engine) -> List[int]:
+    with bind.connect() as conn:
+        return list(conn.scalars(select(schema_migrations.c.version).order_by(schema_migrations.c.version)))
+
+
+def run_migrations(bind: Engine = engine) -> List[int]:
+    """Apply every pending migration in order, each in its own transaction; returns the versions applied"""
+    schema_migrations.create(bind, checkfirst=True)
+
+    applied = []
+    for step in sorted(MIGRATIONS):
+        try:
+            with bind.begin() as conn:
+                done = conn.scalar(select(schema_migrations.c.version).where(
+                    schema_migrations.c.version == step.version
+                ))
+                if done is not None:
+                    continue
+                step.upgrade(conn)
+                conn.execute(insert(schema_migrations).values(version=step.version, name=step.name))
+            applied.append(step.version)
+        except IntegrityError:
+            # Another worker recorded this version first; the step itself is idempotent
+            continue
+    return applied
+
+
+if __name__ == "__main__":
+    applied = run_migrations()
+    print(f"Applied migrations: {applied or 'none'}; database at version {max(applied_versions(engine), default=0)}")
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple, TypeVar
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from .config import settings
+from .database import AsyncSessionLocal, TimedSession, batch_engine, engine, sqlite_performance_mode
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteWork = Callable[[Session], T]
+
+# Attempts at taking the write lock for a batch, on top of SQLite's own busy timeout
+BUSY_RETRIES = 5
+BUSY_BACKOFF_SECONDS = 0.05
+
+
+def _is_busy(error: OperationalError) -> bool:
+    message = str(error.orig).lower()
+    return "database is locked" in message or "database is busy" in message
+
+
+class WriteBatcher:
+    """Coalesces small insert transactions from concurrent callers into group commits.
+
+    Each unit of work is a function taking a sync Session. With batching
+    enabled, a single writer thread drains every unit queued since its last
+    commit (up to ``max_batch``), opens one ``BEGIN IMMEDIATE`` transaction
+    for them, runs each inside its own SAVEPOINT so one failure does not
+    affect the others, and commits them together. SQLite then pays one fsync
+    and one write lock per batch instead of per request, and units that read
+    before writing cannot lose the write lock to another connection.
+
+    With batching disabled (e.g. on PostgreSQL) each unit simply runs in its
+    own transaction on the async engine.
+    """
+
+    def __init__(self, enabled: bool, max_batch: int = 64, window_seconds: float = 0.0):
+        self.enabled = enabled
+        self.max_batch = max_batch
+        self.window_seconds = window_seconds
+        self.batches = 0
+        self.writes = 0
+        self._queue: "queue.Queue[Optional[Tuple[WriteWork, Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    async def run(self, work: WriteWork) -> T:
+        """Run a unit of work from async code and return its result once committed"""
+        if not self.enabled:
+            async with AsyncSessionLocal() as session:
+                result = await session.run_sync(work)
+                await session.commit()
+                return result
+        return await asyncio.wrap_future(self._submit(work))
+
+    def run_blocking(self, work: WriteWork) -> T:
+        """Run a unit of work from a worker thread and return its result once committed"""
+        if not self.enabled:
+            with TimedSession(engine, expire_on_commit=False) as session:
+                result = work(session)
+                session.commit()
+                return result
+        return self._submit(work).result()
+
+    def _submit(self, work: WriteWork) -> Future:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._writer, name="write-batcher", daemon=True)
+                self._thread.start()
+        future: Future = Future()
+        self._queue.put((work, future))
+        return future
+
+    def _next_batch(self) -> List[Tuple[WriteWork, Future]]:
+        first = self._queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.window_seconds
+
+        # Take whatever queued up during the previous commit, optionally waiting a little longer
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # finish this batch, then stop
+                break
+            batch.append(item)
+        return batch
+
+    def _writer(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+
+            batch = [(work, future) for work, future in batch if future.set_running_or_notify_cancel()]
+            done = []
+            with TimedSession(batch_engine, expire_on_commit=False) as session:
+                try:
+                    self._begin(session)
+                except Exception as e:
+                    logger.exception("Error starting write batch")
+                    for _, future in batch:
+                        future.set_exception(e)
+                    continue
+
+                for work, future in batch:
+                    try:
+                        with session.begin_nested():
+                            done.append((future, work(session)))
+                    except Exception as e:
+                        future.set_exception(e)
+
+                try:
+                    session.commit()
+                except Exception as e:
+                    session.rollback()
+                    logger.exception("Error committing write batch")
+                    for future, _ in done:
+                        future.set_exception(e)
+                    continue
+
+            self.batches += 1
+            self.writes += len(done)
+            for future, result in done:
+                future.set_result(result)
+
+    @staticmethod
+    def _begin(session: Session):
+        """Start the batch's transaction, retrying while another connection holds the write lock"""
+        for attempt in range(BUSY_RETRIES):
+            try:
+                session.connection()  # BEGIN IMMEDIATE on the batch engine
+                return
+            except OperationalError as e:
+                session.rollback()
+                if not _is_busy(e) or attempt == BUSY_RETRIES - 1:
+                    raise
+                time.sleep(BUSY_BACKOFF_SECONDS * 2 ** attempt)
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+
+write_batcher = WriteBatcher(
+    enabled=sqlite_performance_mode(settings.DATABASE_URL),
+    max_batch=settings.SQLITE_WRITE_BATCH_MAX,
+    window_seconds=settings.SQLITE_WRITE_BATCH_WINDOW_MS / 1000
+)
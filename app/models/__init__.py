@@ -2,6 +2,9 @@ from .user import User
 from .resume import Resume
 from .analysis_result import AnalysisResult
 from .job_match import JobMatch
+from .analysis_job import AnalysisJob
+from .skill import Skill, SkillPosting
+from .corpus import CorpusTerm, CorpusSnapshot
 from ..core.database import Base
 
-__all__ = ["User", "Resume", "AnalysisResult", "JobMatch", "Base"]
+__all__ = ["User", "Resume", "AnalysisResult", "JobMatch", "AnalysisJob", "Skill", "SkillPosting", "CorpusTerm", "CorpusSnapshot", "Base"]
@@ -1,20 +1,26 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..core.database import Base
+from ..core.json_types import JSONType
 
 class AnalysisResult(Base):
     __tablename__ = "analysis_results"
+    __table_args__ = (
+        Index("ux_analysis_results_resume_id", "resume_id", unique=True),  # one analysis per resume
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
     ats_score = Column(Float, nullable=False)
-    skills = Column(Text)  # JSON string of extracted skills
-    feedback = Column(Text)  # JSON string of AI feedback
-    suggestions = Column(Text)  # JSON string of improvement suggestions
+    skills = Column(JSONType)  # list of extracted skills
+    feedback = Column(JSONType)  # analysis details
+    suggestions = Column(JSONType)  # list of improvement suggestions
     grammar_score = Column(Float)
     formatting_score = Column(Float)
     keyword_score = Column(Float)
+    analyzer_version = Column(String)  # AIAnalyzer.analysis_version() that produced the scores
+    vocabulary_versions = Column(JSONType)  # fingerprint of each keyword vocabulary used
     analyzed_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+class CorpusTerm(Base):
+    # Document frequency of a term across all resumes, as of the latest snapshot
+    __tablename__ = "corpus_terms"
+    
+    term = Column(String, primary_key=True)
+    document_count = Column(Integer, nullable=False)  # resumes containing the term
+
+class CorpusSnapshot(Base):
+    # One row per rebuild of corpus_terms; the newest row describes the current table
+    __tablename__ = "corpus_snapshots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    documents = Column(Integer, nullable=False)  # resumes counted
+    terms = Column(Integer, nullable=False)  # distinct terms counted
+    built_at = Column(DateTime(timezone=True), server_default=func.now())
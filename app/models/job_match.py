@@ -1,19 +1,24 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..core.database import Base
+from ..core.json_types import JSONType
 
 class JobMatch(Base):
     __tablename__ = "job_matches"
+    __table_args__ = (
+        Index("ix_job_matches_resume_id_id", "resume_id", "id"),  # keyset pagination
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
     job_description = Column(Text, nullable=False)
     job_title = Column(String)
-    match_score = Column(Float, nullable=False)
-    missing_skills = Column(Text)  # JSON string of missing skills
-    overlapping_skills = Column(Text)  # JSON string of overlapping skills
-    suggestions = Column(Text)  # JSON string of job-specific suggestions
+    match_score = Column(Float, nullable=False)  # share of the job's required skills the resume covers, 0-100
+    text_similarity = Column(Float)  # TF-IDF cosine similarity of the resume and job texts, 0-1
+    missing_skills = Column(JSONType)  # list of missing skills
+    overlapping_skills = Column(JSONType)  # list of overlapping skills
+    suggestions = Column(JSONType)  # list of job-specific suggestions
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
@@ -1,17 +1,25 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..core.database import Base
+from ..core.json_types import JSONType
 
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        Index("ix_resumes_user_id_id", "user_id", "id"),  # keyset pagination
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     filename = Column(String, nullable=False)
     file_type = Column(String, nullable=False)  # pdf, docx
     resume_text = Column(Text, nullable=False)
-    parsed_data = Column(Text)  # JSON string of parsed resume data
+    parsed_data = Column(JSONType)  # parsed resume data
+    skill_bits = Column(String)  # hex bitset over Skill ids
+    skill_vocab_version = Column(String)  # vocabulary version skill_bits was computed with
+    term_counts = Column(JSONType)  # term -> occurrences, for TF-IDF matching
+    term_counts_version = Column(String)  # tokenizer version term_counts was computed with
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from ..core.database import Base
+
+class Skill(Base):
+    __tablename__ = "skills"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)  # normalized (lowercase) skill name
+
+class SkillPosting(Base):
+    # Inverted index entry: resume_id mentions skill_id; keyed by owner first so
+    # a search only reads the postings of the requesting user
+    __tablename__ = "skill_postings"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id"), primary_key=True, index=True)
@@ -1,11 +1,13 @@
 from .user import UserCreate, UserLogin, UserResponse, Token
-from .resume import ResumeCreate, ResumeResponse
+from .resume import ResumeCreate, ResumeResponse, SimilarResume
 from .analysis_result import AnalysisResultResponse
-from .job_match import JobMatchCreate, JobMatchResponse
+from .analysis_job import AnalysisJobResponse
+from .job_match import JobMatchCreate, JobBatchMatchCreate, JobMatchResponse, JobMatchSummary, CandidateSearch, CandidateResult, SemanticSearch
 
 __all__ = [
     "UserCreate", "UserLogin", "UserResponse", "Token",
-    "ResumeCreate", "ResumeResponse", 
-    "AnalysisResultResponse",
-    "JobMatchCreate", "JobMatchResponse"
+    "ResumeCreate", "ResumeResponse", "SimilarResume",
+    "AnalysisResultResponse", "AnalysisJobResponse",
+    "JobMatchCreate", "JobBatchMatchCreate", "JobMatchResponse", "JobMatchSummary",
+    "CandidateSearch", "CandidateResult", "SemanticSearch"
 ]
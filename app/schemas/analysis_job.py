@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from .analysis_result import AnalysisResultResponse
+
+class AnalysisJobResponse(BaseModel):
+    id: int
+    resume_id: int
+    status: str  # pending, running, done, failed
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[AnalysisResultResponse] = None
+    
+    class Config:
+        from_attributes = True
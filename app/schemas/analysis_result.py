@@ -12,6 +12,7 @@ class AnalysisResultResponse(BaseModel):
     grammar_score: Optional[float] = None
     formatting_score: Optional[float] = None
     keyword_score: Optional[float] = None
+    analyzer_version: Optional[str] = None
     analyzed_at: datetime
     
     class Config:
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
@@ -6,12 +6,33 @@ class JobMatchCreate(BaseModel):
     job_description: str
     job_title: Optional[str] = None
 
+class JobBatchMatchCreate(JobMatchCreate):
+    resume_ids: Optional[List[int]] = None  # None matches all of the user's resumes
+
+class CandidateSearch(BaseModel):
+    job_description: Optional[str] = None
+    skills: Optional[List[str]] = None  # takes precedence over job_description
+    top_k: int = Field(20, ge=1, le=500)
+    require_all: bool = False
+
+class SemanticSearch(BaseModel):
+    job_description: str
+    top_k: int = Field(20, ge=1, le=500)
+
+class CandidateResult(BaseModel):
+    resume_id: int
+    filename: str
+    match_score: float
+    matching_skills: List[str]
+    missing_skills: List[str]
+
 class JobMatchResponse(BaseModel):
     id: int
     resume_id: int
     job_description: str
     job_title: Optional[str] = None
     match_score: float
+    text_similarity: Optional[float] = None
     missing_skills: List[str]
     overlapping_skills: List[str]
     suggestions: List[str]
@@ -20,6 +41,10 @@ class JobMatchResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class JobMatchSummary(JobMatchResponse):
+    # List item; the (often long) job description is only included on request
+    job_description: Optional[str] = None
+
 class SkillMatchAnalysis(BaseModel):
     match_percentage: float
     missing_skills: List[str]
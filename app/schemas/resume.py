@@ -18,6 +18,11 @@ class ResumeResponse(ResumeBase):
     class Config:
         from_attributes = True
 
+class SimilarResume(BaseModel):
+    resume_id: int
+    filename: str
+    similarity: float  # cosine similarity of the embeddings, -1 to 1
+
 class ParsedResumeData(BaseModel):
     name: Optional[str] = None
     email: Optional[str] = None
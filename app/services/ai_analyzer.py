@@ -1,9 +1,14 @@
 import re
 import json
-import random
-from typing import Dict, Any, List
+import hashlib
+from typing import Dict, Any, List, Optional, Set
+from ..core.metrics import metrics
+from .keyword_matcher import KeywordHits, get_keyword_matcher
 
 class AIAnalyzer:
+    # Bump whenever scoring logic changes; vocabulary edits are detected on their own
+    VERSION = "1"
+    
     def __init__(self):
         self.ats_keywords = [
             "experience", "skills", "education", "project", "developed", "managed",
@@ -21,22 +26,68 @@ class AIAnalyzer:
             "python", "javascript", "react", "node", "sql", "aws", "docker",
             "kubernetes", "git", "api", "rest", "graphql", "mongodb", "postgresql"
         ]
+        
+        # Common tech skills
+        self.skill_keywords = [
+            "python", "javascript", "react", "node.js", "nodejs", "sql", "mysql", 
+            "postgresql", "mongodb", "aws", "amazon web services", "docker", 
+            "kubernetes", "k8s", "git", "github", "gitlab", "ci/cd",
+            "html", "css", "typescript", "java", "c++", "c#", "php",
+            "angular", "vue", "flask", "django", "fastapi", "express",
+            "rest api", "graphql", "api", "linux", "ubuntu", "windows"
+        ]
+
+    def vocabularies(self) -> Dict[str, List[str]]:
+        return {
+            "ats": self.ats_keywords,
+            "action": self.action_verbs,
+            "tech": self.tech_keywords,
+            "skills": self.skill_keywords
+        }
 
-    def calculate_ats_score(self, resume_text: str) -> Dict[str, Any]:
+    def vocabulary_versions(self) -> Dict[str, str]:
+        """Fingerprint of each keyword vocabulary, stored with results to find stale parts"""
+        return {
+            category: hashlib.sha1(json.dumps(keywords).encode("utf-8")).hexdigest()[:12]
+            for category, keywords in self.vocabularies().items()
+        }
+
+    def analysis_version(self) -> str:
+        """Scoring version plus a fingerprint of every vocabulary; changes whenever results would"""
+        versions = json.dumps(self.vocabulary_versions(), sort_keys=True)
+        return f"{self.VERSION}:{hashlib.sha1(versions.encode('utf-8')).hexdigest()[:12]}"
+
+    def changed_vocabularies(self, analyzer_version: Optional[str], vocabulary_versions: Optional[Dict[str, str]]) -> Optional[Set[str]]:
+        """Vocabularies that changed since a stored analysis, or None if it must be redone from scratch"""
+        if not analyzer_version or analyzer_version.split(":")[0] != self.VERSION or not isinstance(vocabulary_versions, dict):
+            return None
+        return {
+            category for category, version in self.vocabulary_versions().items()
+            if vocabulary_versions.get(category) != version
+        }
+
+    def scan_keywords(self, text: str) -> KeywordHits:
+        """Find every vocabulary keyword in the text, once for all scorers"""
+        matcher = get_keyword_matcher(self.vocabularies())
+        return matcher.scan(text.lower())
+
+    def calculate_ats_score(self, resume_text: str, hits: Optional[KeywordHits] = None) -> Dict[str, Any]:
         """Calculate ATS score based on keywords and structure"""
-        text_lower = resume_text.lower()
+        if hits is None:
+            hits = self.scan_keywords(resume_text)
+        
+        keywords_found = hits.found("ats")
+        actions_found = hits.found("action")
+        tech_found = hits.found("tech")
         
         # Count ATS keywords
-        keyword_count = sum(1 for keyword in self.ats_keywords if keyword in text_lower)
-        keyword_score = min((keyword_count / len(self.ats_keywords)) * 100, 100)
+        keyword_score = min((len(keywords_found) / len(self.ats_keywords)) * 100, 100)
         
         # Count action verbs
-        action_count = sum(1 for verb in self.action_verbs if verb in text_lower)
-        action_score = min((action_count / len(self.action_verbs)) * 100, 100)
+        action_score = min((len(actions_found) / len(self.action_verbs)) * 100, 100)
         
         # Count tech keywords
-        tech_count = sum(1 for tech in self.tech_keywords if tech in text_lower)
-        tech_score = min((tech_count / len(self.tech_keywords)) * 100, 100)
+        tech_score = min((len(tech_found) / len(self.tech_keywords)) * 100, 100)
         
         # Calculate overall score
         overall_score = (keyword_score * 0.4 + action_score * 0.3 + tech_score * 0.3)
@@ -46,31 +97,32 @@ class AIAnalyzer:
             "keyword_score": round(keyword_score, 1),
             "action_score": round(action_score, 1),
             "tech_score": round(tech_score, 1),
-            "keywords_found": [kw for kw in self.ats_keywords if kw in text_lower],
-            "actions_found": [av for av in self.action_verbs if av in text_lower],
-            "tech_found": [tk for tk in self.tech_keywords if tk in text_lower]
+            "keywords_found": keywords_found,
+            "actions_found": actions_found,
+            "tech_found": tech_found
         }
 
-    def extract_skills(self, resume_text: str) -> List[str]:
+    def extract_skills(self, resume_text: str, hits: Optional[KeywordHits] = None) -> List[str]:
         """Extract skills from resume text"""
-        text_lower = resume_text.lower()
-        found_skills = []
+        if hits is None:
+            hits = self.scan_keywords(resume_text)
         
-        # Common tech skills
-        tech_skills = [
-            "python", "javascript", "react", "node.js", "nodejs", "sql", "mysql", 
-            "postgresql", "mongodb", "aws", "amazon web services", "docker", 
-            "kubernetes", "k8s", "git", "github", "gitlab", "ci/cd",
-            "html", "css", "typescript", "java", "c++", "c#", "php",
-            "angular", "vue", "flask", "django", "fastapi", "express",
-            "rest api", "graphql", "api", "linux", "ubuntu", "windows"
-        ]
+        found_skills = [skill.title() for skill in hits.found("skills")]
         
-        for skill in tech_skills:
-            if skill in text_lower:
-                found_skills.append(skill.title())
+        # De-duplicate in vocabulary order so the result is the same in every process
+        return list(dict.fromkeys(found_skills))
+
+    def skills_from_vocabulary(self, skill_names: Set[str]) -> List[str]:
+        """Same result as extract_skills, from precomputed normalized skill names"""
+        found_skills = [skill.title() for skill in self.skill_keywords if skill in skill_names]
         
-        return list(set(found_skills))
+        return list(dict.fromkeys(found_skills))
+
+    @staticmethod
+    def stable_variation(resume_text: str, salt: str, low: int = -5, high: int = 10) -> int:
+        """Pseudo-random integer in [low, high] derived from the text, so a resume always scores the same"""
+        digest = hashlib.sha256(f"{salt}:{resume_text}".encode("utf-8")).digest()
+        return low + int.from_bytes(digest[:8], "big") % (high - low + 1)
 
     def analyze_grammar(self, resume_text: str) -> Dict[str, Any]:
         """Basic grammar and formatting analysis"""
@@ -81,7 +133,7 @@ class AIAnalyzer:
         has_bullet_points = '•' in resume_text or '-' in resume_text
         has_consistent_formatting = len(re.findall(r'\b[A-Z][a-z]+:', resume_text)) > 0
         
-        grammar_score = 85 + random.randint(-5, 10)  # Base score with some variation
+        grammar_score = 85 + self.stable_variation(resume_text, "grammar")  # Base score with some variation
         if has_bullet_points:
             grammar_score += 5
         if has_consistent_formatting:
@@ -116,13 +168,18 @@ class AIAnalyzer:
         
         return suggestions
 
-    def analyze_resume(self, resume_text: str, job_description: str = None) -> Dict[str, Any]:
-        """Complete resume analysis"""
+    @metrics.timed("resume_analysis_seconds")
+    def analyze_resume(self, resume_text: str, job_description: str = None, skills: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Complete resume analysis (``skills`` may be passed in if already known)"""
+        # One keyword scan feeds every scoring step
+        hits = self.scan_keywords(resume_text)
+        
         # ATS Analysis
-        ats_analysis = self.calculate_ats_score(resume_text)
+        ats_analysis = self.calculate_ats_score(resume_text, hits)
         
         # Skills Extraction
-        skills = self.extract_skills(resume_text)
+        if skills is None:
+            skills = self.extract_skills(resume_text, hits)
         
         # Grammar Analysis
         grammar_analysis = self.analyze_grammar(resume_text)
@@ -136,38 +193,67 @@ class AIAnalyzer:
         # Job matching (if job description provided)
         job_match = None
         if job_description:
-            job_match = self.match_with_job(resume_text, job_description)
+            job_match = self.match_with_job(resume_text, job_description, hits)
         
         return {
             "ats_score": ats_analysis["ats_score"],
             "grammar_score": grammar_analysis["grammar_score"],
-            "formatting_score": 85 + random.randint(-5, 10),  # Simulated formatting score
+            "formatting_score": 85 + self.stable_variation(resume_text, "formatting"),  # Simulated formatting score
+            "keyword_score": ats_analysis["keyword_score"],
             "skills": skills,
             "suggestions": suggestions,
             "job_match": job_match,
             "analysis_details": {
                 "keyword_analysis": ats_analysis,
                 "grammar_analysis": grammar_analysis
-            }
+            },
+            "analyzer_version": self.analysis_version(),
+            "vocabulary_versions": self.vocabulary_versions()
         }
 
-    def match_with_job(self, resume_text: str, job_description: str) -> Dict[str, Any]:
-        """Match resume with job description"""
-        resume_lower = resume_text.lower()
-        job_lower = job_description.lower()
+    def rescore(self, resume_text: str, previous: Dict[str, Any], changed: Set[str], skills: List[str]) -> Dict[str, Any]:
+        """Update a stored analysis (same shape as analyze_resume) after vocabulary changes.
+
+        Only the parts that read a changed vocabulary are recomputed; grammar
+        and formatting scores do not depend on any vocabulary and are kept.
+        """
+        analysis = dict(previous)
+        details = dict(previous["analysis_details"])
         
-        # Extract skills from both
-        resume_skills = self.extract_skills(resume_text)
+        # ATS, action and tech keywords together make up the keyword analysis
+        if changed & {"ats", "action", "tech"}:
+            ats_analysis = self.calculate_ats_score(resume_text)
+            details["keyword_analysis"] = ats_analysis
+            analysis["ats_score"] = ats_analysis["ats_score"]
+            analysis["keyword_score"] = ats_analysis["keyword_score"]
+        
+        if "skills" in changed:
+            analysis["skills"] = skills
         
-        # Common job requirements
-        job_requirements = []
-        for skill in self.tech_keywords:
-            if skill in job_lower:
-                job_requirements.append(skill.title())
+        analysis["suggestions"] = self.generate_suggestions({
+            "ats_score": analysis["ats_score"],
+            "skills": analysis["skills"]
+        })
+        analysis["analysis_details"] = details
+        analysis["analyzer_version"] = self.analysis_version()
+        analysis["vocabulary_versions"] = self.vocabulary_versions()
+        return analysis
+
+    def extract_job_requirements(self, job_description: str) -> List[str]:
+        """Common job requirements mentioned in a job description"""
+        return [skill.title() for skill in self.scan_keywords(job_description).found("tech")]
+
+    def score_skill_match(self, resume_skills: List[str], job_requirements: List[str], text_similarity: Optional[float] = None) -> Dict[str, Any]:
+        """Score a resume's skills against already extracted job requirements.
+
+        ``match_score`` is always requirement coverage; ``text_similarity``
+        (TF-IDF cosine of the full texts, 0-1) is reported next to it as is.
+        """
+        present = {skill.lower() for skill in resume_skills}
         
-        # Calculate overlap
-        matching_skills = [skill for skill in resume_skills if skill.lower() in [req.lower() for req in job_requirements]]
-        missing_skills = [req for req in job_requirements if req.lower() not in [skill.lower() for skill in resume_skills]]
+        # Calculate overlap, in requirement order whatever order the resume's skills came in
+        matching_skills = [req for req in job_requirements if req.lower() in present]
+        missing_skills = [req for req in job_requirements if req.lower() not in present]
         
         # Calculate match score
         if len(job_requirements) > 0:
@@ -177,6 +263,7 @@ class AIAnalyzer:
         
         return {
             "match_score": round(match_percentage, 1),
+            "text_similarity": round(float(text_similarity), 4) if text_similarity is not None else None,
             "matching_skills": matching_skills,
             "missing_skills": missing_skills,
             "job_requirements": job_requirements,
@@ -187,3 +274,30 @@ class AIAnalyzer:
                 "Add specific projects that demonstrate these skills"
             ]
         }
+
+    @staticmethod
+    def rank_score(match_score: float, text_similarity: Optional[float], text_weight: float) -> float:
+        """Ranking key blending requirement coverage with text similarity (both as 0-100)"""
+        return (1 - text_weight) * match_score + text_weight * 100 * (text_similarity or 0.0)
+
+    def match_with_job(self, resume_text: str, job_description: str, resume_hits: Optional[KeywordHits] = None) -> Dict[str, Any]:
+        """Match resume with job description"""
+        # Extract skills from both
+        resume_skills = self.extract_skills(resume_text, resume_hits)
+        job_requirements = self.extract_job_requirements(job_description)
+        
+        return self.score_skill_match(resume_skills, job_requirements)
+
+    @metrics.timed("job_match_seconds")
+    def compare_with_job_description(self, resume_text: str, job_description: str, resume_skills: Optional[List[str]] = None, text_similarity: Optional[float] = None) -> Dict[str, Any]:
+        """Job match in the shape stored on JobMatch"""
+        if resume_skills is None:
+            resume_skills = self.extract_skills(resume_text)
+        match = self.score_skill_match(resume_skills, self.extract_job_requirements(job_description), text_similarity)
+        return {
+            "match_score": match["match_score"],
+            "text_similarity": match["text_similarity"],
+            "missing_skills": match["missing_skills"],
+            "overlapping_skills": match["matching_skills"],
+            "suggestions": match["suggestions"]
+        }
@@ -0,0 +1,18 @@
+import hashlib
+from ..core.config import settings
+from .ai_analyzer import AIAnalyzer
+from .content_cache import TieredCache
+
+analysis_cache = TieredCache(
+    "analysis",
+    memory_entries=settings.ANALYSIS_CACHE_MEMORY_ENTRIES,
+    disk_path=settings.ANALYSIS_CACHE_PATH or None,
+    max_disk_bytes=settings.ANALYSIS_CACHE_MAX_BYTES
+)
+
+# Vocabularies are defined in code, so the version is fixed for the life of the process
+ANALYSIS_VERSION = AIAnalyzer().analysis_version()
+
+def analysis_cache_key(resume_text: str) -> str:
+    """Cache key for a resume analysis: text hash plus analyzer and vocabulary version"""
+    return f"{hashlib.sha256(resume_text.encode('utf-8')).hexdigest()}:{ANALYSIS_VERSION}"
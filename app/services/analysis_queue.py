@@ -0,0 +1,262 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import or_
+from sqlalchemy.sql import func
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.write_batcher import write_batcher
+from ..models import AnalysisJob, AnalysisResult, Resume
+from .ai_analyzer import AIAnalyzer
+from .analysis_cache import ANALYSIS_VERSION, analysis_cache, analysis_cache_key
+from .skill_vectors import skill_vocabulary
+
+logger = logging.getLogger(__name__)
+
+
+def analysis_columns(analysis: dict) -> dict:
+    """AnalysisResult column values of an analysis (the dict built by AIAnalyzer.analyze_resume)"""
+    return {
+        "ats_score": analysis["ats_score"],
+        "skills": analysis["skills"],
+        "feedback": analysis["analysis_details"],
+        "suggestions": analysis["suggestions"],
+        "grammar_score": analysis.get("grammar_score"),
+        "formatting_score": analysis.get("formatting_score"),
+        "keyword_score": analysis.get("keyword_score"),
+        "analyzer_version": analysis.get("analyzer_version"),
+        "vocabulary_versions": analysis.get("vocabulary_versions")
+    }
+
+
+def stored_analysis(analysis_result: AnalysisResult) -> dict:
+    """The analysis dict a stored result was built from"""
+    return {
+        "ats_score": analysis_result.ats_score,
+        "grammar_score": analysis_result.grammar_score,
+        "formatting_score": analysis_result.formatting_score,
+        "keyword_score": analysis_result.keyword_score,
+        "skills": analysis_result.skills,
+        "suggestions": analysis_result.suggestions,
+        "job_match": None,
+        "analysis_details": analysis_result.feedback
+    }
+
+
+def refresh_analysis(db, analyzer: AIAnalyzer, resume: Resume, analysis_result: Optional[AnalysisResult] = None) -> Tuple[dict, str]:
+    """Current analysis of a resume and how it was obtained ("cached", "partial" or "full").
+
+    Identical text reuses the memoized analysis. A stored result from the same
+    analyzer version only has the parts whose vocabulary changed recomputed.
+    Skills always come from the resume's skill vector, which is re-encoded
+    only if the skill vocabulary changed (caller commits).
+    """
+    cache_key = analysis_cache_key(resume.resume_text)
+    analysis = analysis_cache.get(cache_key)
+    if analysis is not None:
+        return analysis, "cached"
+
+    skills = analyzer.skills_from_vocabulary(skill_vocabulary.resume_skills(db, resume))
+    changed = None
+    if analysis_result is not None and {"keyword_analysis", "grammar_analysis"} <= set(analysis_result.feedback or {}):
+        changed = analyzer.changed_vocabularies(analysis_result.analyzer_version, analysis_result.vocabulary_versions)
+
+    if changed is None:
+        analysis, mode = analyzer.analyze_resume(resume.resume_text, skills=skills), "full"
+    else:
+        analysis, mode = analyzer.rescore(resume.resume_text, stored_analysis(analysis_result), changed, skills), "partial"
+    analysis_cache.put(cache_key, analysis)
+    return analysis, mode
+
+
+def store_analysis(session, job_id: int, resume_id: int, analysis: dict) -> int:
+    """Save a resume's analysis, replacing an outdated one, and mark its job done (one unit of batched write work)"""
+    analysis_result = session.query(AnalysisResult).filter(AnalysisResult.resume_id == resume_id).first()
+    if analysis_result is None:
+        analysis_result = AnalysisResult(resume_id=resume_id, **analysis_columns(analysis))
+        session.add(analysis_result)
+    else:
+        for column, value in analysis_columns(analysis).items():
+            setattr(analysis_result, column, value)
+        analysis_result.analyzed_at = func.now()
+    session.flush()
+    session.query(AnalysisJob).filter(AnalysisJob.id == job_id).update(
+        {"status": "done", "analysis_result_id": analysis_result.id, "finished_at": func.now()},
+        synchronize_session=False
+    )
+    return analysis_result.id
+
+
+def lease_deadline() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=settings.ANALYSIS_LEASE_SECONDS)
+
+
+def renew_lease(job_id: int):
+    """Extend a running job's lease so other workers leave it alone"""
+    db = SessionLocal()
+    try:
+        db.query(AnalysisJob).filter(
+            AnalysisJob.id == job_id,
+            AnalysisJob.status == "running"
+        ).update({"lease_expires_at": lease_deadline()}, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_analysis_job(job_id: int):
+    """Analyze the job's resume and store the result (blocking; runs in a thread)"""
+    db = SessionLocal()
+    try:
+        # Claim the job; another worker may have picked it up already
+        claimed = db.query(AnalysisJob).filter(
+            AnalysisJob.id == job_id,
+            AnalysisJob.status == "pending"
+        ).update(
+            {"status": "running", "started_at": func.now(), "lease_expires_at": lease_deadline()},
+            synchronize_session=False
+        )
+        db.commit()
+        if not claimed:
+            return
+
+        job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+        try:
+            analysis_result = db.query(AnalysisResult).filter(
+                AnalysisResult.resume_id == job.resume_id
+            ).first()
+
+            # Results from an older analyzer or vocabulary are brought up to date
+            if analysis_result is None or analysis_result.analyzer_version != ANALYSIS_VERSION:
+                resume = db.query(Resume).filter(Resume.id == job.resume_id).first()
+                if resume is None:
+                    raise ValueError("Resume no longer exists")
+
+                analysis, _ = refresh_analysis(db, AIAnalyzer(), resume, analysis_result)
+                resume_id = resume.id
+                db.commit()  # release any write lock before handing off the write
+                
+                # The result and the job's completion are committed together
+                write_batcher.run_blocking(lambda session: store_analysis(session, job_id, resume_id, analysis))
+                return
+
+            job.status = "done"
+            job.analysis_result_id = analysis_result.id
+        except Exception as e:
+            db.rollback()
+            job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+            job.status = "failed"
+            job.error = f"Error analyzing resume: {str(e)}"
+
+        job.finished_at = func.now()
+        db.commit()
+    finally:
+        db.close()
+
+
+class AnalysisQueue:
+    """In-process asyncio worker pool draining the persistent analysis_jobs table.
+
+    Job ids are queued in memory; the rows themselves are the source of truth,
+    so jobs that were pending when the process stopped are picked up again on
+    the next start. A running job holds a lease that its worker renews; only
+    jobs whose lease expired (their worker died) are retried, so several
+    processes can share the table without running a job twice.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        for job_id in await asyncio.to_thread(self._recover_jobs):
+            self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._reclaim()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def enqueue(self, job_id: int):
+        # Without running workers the job stays pending and is recovered on start
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+
+    @staticmethod
+    def _reclaim_expired(db) -> List[int]:
+        """Return running jobs whose lease expired to pending (caller commits)"""
+        expired = (
+            AnalysisJob.status == "running",
+            or_(AnalysisJob.lease_expires_at.is_(None), AnalysisJob.lease_expires_at < datetime.now(timezone.utc))
+        )
+        job_ids = [job.id for job in db.query(AnalysisJob.id).filter(*expired)]
+        if job_ids:
+            db.query(AnalysisJob).filter(AnalysisJob.id.in_(job_ids), *expired).update(
+                {"status": "pending", "started_at": None, "lease_expires_at": None}, synchronize_session=False
+            )
+        return job_ids
+
+    @classmethod
+    def _recover_jobs(cls) -> List[int]:
+        db = SessionLocal()
+        try:
+            # Jobs whose worker died mid-run are retried from scratch
+            cls._reclaim_expired(db)
+            db.commit()
+            jobs = db.query(AnalysisJob.id).filter(
+                AnalysisJob.status == "pending"
+            ).order_by(AnalysisJob.id).all()
+            return [job.id for job in jobs]
+        finally:
+            db.close()
+
+    @classmethod
+    def _recover_expired_jobs(cls) -> List[int]:
+        db = SessionLocal()
+        try:
+            job_ids = cls._reclaim_expired(db)
+            db.commit()
+            return job_ids
+        finally:
+            db.close()
+
+    async def _reclaim(self):
+        """Periodically retry jobs left running by a worker in another process that died"""
+        while True:
+            await asyncio.sleep(settings.ANALYSIS_LEASE_SECONDS)
+            try:
+                for job_id in await asyncio.to_thread(self._recover_expired_jobs):
+                    self._queue.put_nowait(job_id)
+            except Exception:
+                logger.exception("Error reclaiming expired analysis jobs")
+
+    async def _heartbeat(self, job_id: int):
+        # Renew well before the lease runs out; does nothing unless the job is running
+        while True:
+            await asyncio.sleep(settings.ANALYSIS_LEASE_SECONDS / 3)
+            try:
+                await asyncio.to_thread(renew_lease, job_id)
+            except Exception:
+                logger.exception("Error renewing lease of analysis job %s", job_id)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+            try:
+                await asyncio.to_thread(run_analysis_job, job_id)
+            except Exception:
+                logger.exception("Error running analysis job %s", job_id)
+            finally:
+                heartbeat.cancel()
+                self._queue.task_done()
+
+
+analysis_queue = AnalysisQueue(workers=settings.ANALYSIS_WORKERS)
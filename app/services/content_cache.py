@@ -0,0 +1,118 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import orjson
+
+
+class TieredCache:
+    """Two-tier cache for JSON-serializable values keyed by content hash.
+
+    Lookups go to an in-process LRU first and then to a SQLite file shared by
+    every worker on the host. The disk tier is bounded by the total size of
+    the stored values; the least recently used entries are evicted first.
+    The size is summed in SQL, so every worker sees the same total.
+
+    Both tiers are accessed synchronously under one lock; async callers go
+    through ``asyncio.to_thread``.
+    """
+
+    def __init__(self, namespace: str, memory_entries: int, disk_path: Optional[str], max_disk_bytes: int):
+        self.namespace = namespace
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if disk_path:
+            self._conn = sqlite3.connect(disk_path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=OFF")  # entries can always be recomputed
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed_at "
+                "ON cache_entries (namespace, accessed_at)"
+            )
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                        (time.time(), self.namespace, key)
+                    )
+                    value = orjson.loads(row[0])
+                    self._remember(key, value)
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._remember(key, value)
+            if self._conn is None:
+                return
+
+            blob = orjson.dumps(value)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, blob, len(blob), time.time())
+            )
+            self._evict_disk()
+
+    def _remember(self, key: str, value: Any):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_bytes(self) -> int:
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+
+    def _evict_disk(self):
+        if self._disk_bytes() <= self.max_disk_bytes:
+            return
+        # Keep the most recently used entries that fit, counting what every worker has stored
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+            "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS kept "
+            "FROM cache_entries WHERE namespace = ?) WHERE kept > ?)",
+            (self.namespace, self.namespace, self.max_disk_bytes)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            disk_bytes = self._disk_bytes() if self._conn is not None else 0
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "disk_bytes": disk_bytes
+        }
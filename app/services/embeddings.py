@@ -0,0 +1,369 @@
+import asyncio
+import json
+import logging
+import math
+import os
+import threading
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from scipy import sparse
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import Resume
+from .tfidf import STOP_WORDS, TOKEN_PATTERN
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; the store is then single-process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class HashingEmbedder:
+    """Dense resume embeddings via the hashing trick; deterministic and needs no model files.
+
+    Unigrams and adjacent-word bigrams are hashed (crc32) into ``dimensions``
+    signed buckets with sublinear term frequency weights, then L2-normalized,
+    so the dot product of two embeddings is their cosine similarity.
+    """
+
+    VERSION = "1"
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    def embed(self, text: str) -> np.ndarray:
+        tokens = [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+        features = Counter(tokens)
+        bigrams = Counter(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for counter, weight in ((features, 1.0), (bigrams, 0.5)):
+            if not counter:
+                continue
+            hashes = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in counter), dtype=np.uint32, count=len(counter))
+            counts = np.fromiter(counter.values(), dtype=np.float32, count=len(counter))
+            # The top bit picks the sign so colliding features tend to cancel out
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(vector, hashes % self.dimensions, signs * weight * (1 + np.log(counts)))
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+
+class EmbeddingStore:
+    """Append-only float32 embedding matrix in memory-mapped files, with an id map.
+
+    ``vectors.f32`` holds one row per embedded resume; ``ids.i64`` and
+    ``owners.i64`` hold each row's resume id and user id, and ``meta.json``
+    the row count. Files grow by doubling. Removed resumes keep their row
+    with the owner set to -1. Appends take a file lock, so processes on one
+    host can share a directory; readers pick up other processes' rows via
+    ``refresh``. Without a directory the matrix lives in memory.
+    """
+
+    def __init__(self, directory: Optional[str], dimensions: int, version: str):
+        self.directory = directory
+        self.dimensions = dimensions
+        self.version = version
+        self.count = 0
+        self.capacity = 0
+        self.vectors = np.zeros((0, dimensions), dtype=np.float32)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.owners = np.zeros(0, dtype=np.int64)
+        self._rows: Dict[int, int] = {}
+        self._meta_mtime = None
+        self._lock = threading.Lock()
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            with self._file_lock():
+                meta = self._read_meta()
+                if meta is None or meta["dimensions"] != dimensions or meta["version"] != version:
+                    # Embeddings from another embedder are useless; start over
+                    self._write_meta(0)
+                    for name in ("vectors.f32", "ids.i64", "owners.i64"):
+                        path = self._path(name)
+                        if os.path.exists(path):
+                            os.remove(path)
+            self.refresh()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self._path("lock"), "a+") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(self._path("meta.json")) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_meta(self, count: int):
+        temporary = self._path("meta.json.tmp")
+        with open(temporary, "w") as f:
+            json.dump({"dimensions": self.dimensions, "version": self.version, "count": count}, f)
+        os.replace(temporary, self._path("meta.json"))
+
+    def _map(self, capacity: int):
+        """(Re)map the files at ``capacity`` rows, growing them if needed"""
+        for name, width in (("vectors.f32", self.dimensions * 4), ("ids.i64", 8), ("owners.i64", 8)):
+            path = self._path(name)
+            with open(path, "ab") as f:
+                if f.tell() < capacity * width:
+                    f.truncate(capacity * width)
+        if capacity:
+            self.vectors = np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="r+", shape=(capacity, self.dimensions))
+            self.ids = np.memmap(self._path("ids.i64"), dtype=np.int64, mode="r+", shape=(capacity,))
+            self.owners = np.memmap(self._path("owners.i64"), dtype=np.int64, mode="r+", shape=(capacity,))
+        self.capacity = capacity
+
+    def refresh(self):
+        """Pick up rows appended by other processes sharing the directory"""
+        if not self.directory:
+            return
+        mtime = os.stat(self._path("meta.json")).st_mtime_ns
+        if mtime == self._meta_mtime:
+            return
+        with self._lock:
+            self._load_meta()
+            self._meta_mtime = mtime
+
+    def _load_meta(self):
+        meta = self._read_meta()
+        count = meta["count"] if meta else 0
+        if count > self.capacity:
+            self._map(os.path.getsize(self._path("ids.i64")) // 8)
+        for row in range(self.count, count):
+            self._rows[int(self.ids[row])] = row
+        self.count = count
+
+    def add(self, items: Sequence[Tuple[int, int, np.ndarray]]):
+        """Append (resume_id, user_id, vector) rows; a re-added id replaces its old row"""
+        if not items:
+            return
+        with self._lock:
+            if self.directory:
+                with self._file_lock():
+                    self._append(items)
+            else:
+                self._append(items)
+
+    def _append(self, items: Sequence[Tuple[int, int, np.ndarray]]):
+        if self.directory:
+            # Another process may have appended since our last look
+            self._load_meta()
+
+        needed = self.count + len(items)
+        if needed > self.capacity:
+            capacity = max(1024, self.capacity * 2, needed)
+            if self.directory:
+                self._map(capacity)
+            else:
+                self.vectors = np.resize(self.vectors, (capacity, self.dimensions))
+                self.ids = np.resize(self.ids, capacity)
+                self.owners = np.resize(self.owners, capacity)
+                self.capacity = capacity
+
+        for offset, (resume_id, user_id, vector) in enumerate(items):
+            row = self.count + offset
+            previous = self._rows.get(resume_id)
+            if previous is not None:
+                self.owners[previous] = -1
+            self.vectors[row] = vector
+            self.ids[row] = resume_id
+            self.owners[row] = user_id
+            self._rows[resume_id] = row
+        self.count = needed
+
+        if self.directory:
+            self.vectors.flush()
+            self.ids.flush()
+            self.owners.flush()
+            self._write_meta(self.count)
+            self._meta_mtime = os.stat(self._path("meta.json")).st_mtime_ns
+
+    def remove(self, resume_id: int):
+        self.refresh()
+        with self._lock:
+            row = self._rows.pop(resume_id, None)
+            if row is not None:
+                self.owners[row] = -1
+
+    def vector(self, resume_id: int) -> Optional[np.ndarray]:
+        self.refresh()
+        row = self._rows.get(resume_id)
+        return None if row is None or self.owners[row] < 0 else np.array(self.vectors[row])
+
+    def resume_ids(self) -> set:
+        self.refresh()
+        return set(self._rows)
+
+
+class IvfIndex:
+    """Inverted-file approximate nearest-neighbour index over the store's first ``indexed`` rows.
+
+    Rows are bucketed by their nearest centroid from spherical k-means; a
+    query scores the centroids, then only the rows of the ``probes`` closest
+    buckets.
+    """
+
+    def __init__(self, centroids: np.ndarray, order: np.ndarray, offsets: np.ndarray, indexed: int):
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+        self.indexed = indexed
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, lists: Optional[int] = None, iterations: int = 10, sample_size: int = 20000, seed: int = 0) -> "IvfIndex":
+        count = len(vectors)
+        lists = lists or min(max(int(math.sqrt(count)), 1), 4096)
+        rng = np.random.default_rng(seed)
+        sample = np.asarray(vectors[np.sort(rng.choice(count, min(count, sample_size), replace=False))])
+        centroids = sample[rng.choice(len(sample), min(lists, len(sample)), replace=False)].copy()
+
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            membership = sparse.csr_matrix(
+                (np.ones(len(sample), dtype=np.float32), (assignment, np.arange(len(sample)))),
+                shape=(len(centroids), len(sample))
+            )
+            sums = np.asarray(membership @ sample)
+            norms = np.linalg.norm(sums, axis=1)
+            # Empty buckets keep their previous centroid
+            filled = norms > 0
+            centroids[filled] = sums[filled] / norms[filled, None]
+
+        assignment = np.concatenate([
+            np.argmax(np.asarray(vectors[start:start + 10000]) @ centroids.T, axis=1)
+            for start in range(0, count, 10000)
+        ]) if count else np.zeros(0, dtype=np.int64)
+        order = np.argsort(assignment, kind="stable")
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(assignment, minlength=len(centroids)))))
+        return cls(centroids, order, offsets, count)
+
+    def probe(self, query: np.ndarray, probes: int) -> np.ndarray:
+        """Rows in the ``probes`` buckets closest to the query"""
+        probes = min(probes, len(self.centroids))
+        nearest = np.argpartition(-(self.centroids @ query), probes - 1)[:probes]
+        return np.concatenate([self.order[self.offsets[bucket]:self.offsets[bucket + 1]] for bucket in nearest])
+
+
+class SimilaritySearch:
+    """Top-k cosine search over a user's resume embeddings.
+
+    Users with up to ``exact_max_rows`` resumes are scanned exactly; larger
+    ones go through the IVF index, plus an exact scan of rows appended since
+    it was built. ``sync`` embeds resumes missing from the store and rebuilds
+    the index once the unindexed tail grows past a tenth of it.
+    """
+
+    def __init__(self, store: EmbeddingStore, embedder: HashingEmbedder, probes: int, exact_max_rows: int):
+        self.store = store
+        self.embedder = embedder
+        self.probes = probes
+        self.exact_max_rows = exact_max_rows
+        self.index: Optional[IvfIndex] = None
+
+    def add(self, items: Sequence[Tuple[int, int, str]]):
+        """Embed and store (resume_id, user_id, resume_text) rows"""
+        self.store.add([(resume_id, user_id, self.embedder.embed(text)) for resume_id, user_id, text in items])
+
+    def search(self, query: np.ndarray, user_id: int, top_k: int, exclude_id: Optional[int] = None) -> List[Tuple[int, float]]:
+        """(resume_id, similarity) of the user's resumes closest to the query, best first"""
+        self.store.refresh()
+        # Count first: appends remap the arrays before publishing a larger count
+        count, index = self.store.count, self.index
+        vectors, ids, owners = self.store.vectors, self.store.ids, np.asarray(self.store.owners[:count])
+
+        user_rows = np.flatnonzero(owners == user_id)
+        if len(user_rows) > self.exact_max_rows and index is not None:
+            candidates = np.concatenate((index.probe(query, self.probes), np.arange(index.indexed, count)))
+            candidates = candidates[owners[candidates] == user_id]
+        else:
+            candidates = user_rows
+        if exclude_id is not None:
+            candidates = candidates[np.asarray(ids[candidates]) != exclude_id]
+        if not len(candidates):
+            return []
+
+        # Sorted rows read the memory-mapped matrix front to back
+        candidates = np.sort(candidates)
+        scores = np.asarray(vectors[candidates]) @ query
+        top = np.argpartition(-scores, min(top_k, len(scores)) - 1)[:top_k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(ids[candidates[i]]), float(scores[i])) for i in top]
+
+    def sync(self, chunk_size: int = 500):
+        """Embed resumes missing from the store, drop deleted ones and rebuild a stale index"""
+        db = SessionLocal()
+        try:
+            stored = self.store.resume_ids()
+            existing = {resume_id for (resume_id,) in db.query(Resume.id)}
+            for resume_id in stored - existing:
+                self.store.remove(resume_id)
+
+            missing = sorted(existing - stored)
+            for start in range(0, len(missing), chunk_size):
+                rows = db.query(Resume.id, Resume.user_id, Resume.resume_text).filter(
+                    Resume.id.in_(missing[start:start + chunk_size])
+                ).all()
+                self.add([(row.id, row.user_id, row.resume_text) for row in rows])
+        finally:
+            db.close()
+
+        self.store.refresh()
+        indexed = self.index.indexed if self.index is not None else 0
+        if self.store.count and self.store.count - indexed > max(1000, indexed // 10):
+            self.index = IvfIndex.build(self.store.vectors[:self.store.count])
+
+
+class EmbeddingMaintainer:
+    """Background task keeping the embedding store and index in step with the resumes table"""
+
+    def __init__(self, search: SimilaritySearch, interval_seconds: float):
+        self.search = search
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.search.sync)
+            except Exception:
+                logger.exception("Error syncing resume embeddings")
+            await asyncio.sleep(self.interval_seconds)
+
+
+embedder = HashingEmbedder(settings.EMBEDDING_DIMENSIONS)
+embedding_store = EmbeddingStore(settings.EMBEDDING_STORE_PATH or None, settings.EMBEDDING_DIMENSIONS, HashingEmbedder.VERSION)
+similarity_search = SimilaritySearch(
+    embedding_store, embedder,
+    probes=settings.EMBEDDING_IVF_PROBES,
+    exact_max_rows=settings.EMBEDDING_EXACT_SEARCH_MAX_ROWS
+)
+embedding_maintainer = EmbeddingMaintainer(similarity_search, interval_seconds=settings.EMBEDDING_SYNC_INTERVAL_SECONDS)
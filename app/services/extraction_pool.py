@@ -0,0 +1,156 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Set, Tuple, Union
+from ..core.config import settings
+from ..core.metrics import metrics
+from .resume_parser import ResumeParser
+
+
+class ExtractionOverloaded(Exception):
+    """Raised when every worker is busy and the extraction queue is full"""
+
+
+class ExtractionTimeout(Exception):
+    """Raised when a document takes longer than the per-document timeout"""
+
+
+def extract_resume(file_type: str, source: Union[bytes, str], timings: Optional[Dict[str, float]] = None) -> Tuple[str, Dict[str, Any]]:
+    """Extract and parse a resume document (runs inside a worker process).
+
+    ``source`` is either the document bytes or the path of a spooled upload,
+    which is read straight from disk. If given, ``timings`` receives the
+    extract and parse seconds and the document size in bytes.
+    """
+    parser = ResumeParser()
+    extract = parser.extract_text_from_pdf if file_type == "pdf" else parser.extract_text_from_docx
+    started = time.perf_counter()
+    if isinstance(source, str):
+        with open(source, "rb") as document:
+            resume_text = extract(document)
+        size = os.path.getsize(source)
+    else:
+        resume_text = extract(source)
+        size = len(source)
+    extracted = time.perf_counter()
+    parsed_data = parser.parse_resume_text(resume_text)
+    if timings is not None:
+        timings.update(extract=extracted - started, parse=time.perf_counter() - extracted, bytes=size)
+    return resume_text, parsed_data
+
+
+def extract_resume_timed(file_type: str, source: Union[bytes, str]) -> Tuple[Tuple[str, Dict[str, Any]], Dict[str, float]]:
+    """extract_resume plus its timings, which the worker cannot record into the parent's metrics itself"""
+    timings: Dict[str, float] = {}
+    return extract_resume(file_type, source, timings), timings
+
+
+class ExtractionPool:
+    """Bounded process pool that keeps document parsing off the event loop.
+
+    At most ``max_workers + queue_depth`` documents are admitted at once; a
+    slot is only released when its worker actually finishes, so documents that
+    time out still count against capacity until their process is free again.
+
+    A running worker cannot be cancelled, so a timeout retires the whole pool:
+    new documents go to a fresh one, and the old pool's processes are
+    terminated once its other in-flight documents are done.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, queue_depth: int = 32, timeout: float = 30.0):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_workers + queue_depth)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight: Dict[ProcessPoolExecutor, Set[Future]] = {}
+        self._lock = threading.Lock()
+
+    def _submit(self, file_type: str, source: Union[bytes, str]) -> Tuple[ProcessPoolExecutor, Future]:
+        # Submit and track under the lock, so a concurrent timeout cannot retire the pool in between
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                self._in_flight[self._executor] = set()
+            executor = self._executor
+            future = executor.submit(extract_resume_timed, file_type, source)
+            self._in_flight[executor].add(future)
+        return executor, future
+
+    def _finished(self, executor: ProcessPoolExecutor, future: Future):
+        with self._lock:
+            self._in_flight.get(executor, set()).discard(future)
+        self._slots.release()
+
+    def _retire_executor(self, executor: ProcessPoolExecutor, stuck: Future):
+        """Route new work to a fresh pool and kill this one's processes after its other documents finish"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+            if executor not in self._in_flight:
+                return  # Already retired by another timeout
+            others = [future for future in self._in_flight.pop(executor) if future is not stuck]
+
+        def reap():
+            # The other documents get the full timeout; any still running then time out themselves
+            wait(others, timeout=self.timeout)
+            processes = list((getattr(executor, "_processes", None) or {}).values())
+            for process in processes:
+                process.terminate()
+            # Terminated workers break the pool, which fails the stuck future and releases its slot
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        threading.Thread(target=reap, name="extraction-pool-reaper", daemon=True).start()
+
+    def _reset_executor(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+            self._in_flight.pop(broken, None)
+        broken.shutdown(wait=False)
+
+    async def extract(self, file_type: str, source: Union[bytes, str]) -> Tuple[str, Dict[str, Any]]:
+        """Extract text and parsed data from a document in a worker process"""
+        if not self._slots.acquire(blocking=False):
+            raise ExtractionOverloaded()
+
+        try:
+            executor, future = self._submit(file_type, source)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda done: self._finished(executor, done))
+
+        try:
+            result, timings = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            # Cancelling only works while the document is still queued
+            if not future.cancel():
+                self._retire_executor(executor, future)
+            raise ExtractionTimeout()
+        except BrokenProcessPool:
+            # A worker died (e.g. crashed on a malformed file); start fresh next time
+            self._reset_executor(executor)
+            raise
+
+        metrics.observe("resume_extract_seconds", timings["extract"], file_type=file_type)
+        metrics.observe("resume_parse_seconds", timings["parse"])
+        metrics.increment("resume_extract_bytes_total", timings["bytes"], file_type=file_type)
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._in_flight.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+extraction_pool = ExtractionPool(
+    max_workers=settings.EXTRACTION_WORKERS,
+    queue_depth=settings.EXTRACTION_QUEUE_DEPTH,
+    timeout=settings.EXTRACTION_TIMEOUT_SECONDS
+)
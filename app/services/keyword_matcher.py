@@ -0,0 +1,92 @@
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+
+class KeywordHits:
+    """Occurrences of a matcher's vocabulary in one scanned text.
+
+    The scan only records where each keyword first occurs; the full list of
+    offsets is located on demand, since scoring only needs presence.
+    """
+
+    def __init__(self, matcher: "KeywordMatcher", text: str, first_offsets: Dict[str, int]):
+        self._matcher = matcher
+        self._text = text
+        self._offsets: Dict[str, List[int]] = {}
+        self.first_offsets = first_offsets  # lowercased keyword -> first start offset
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword.lower() in self.first_offsets
+
+    def positions(self, keyword: str) -> List[int]:
+        """Start offsets of every (possibly overlapping) occurrence of a keyword"""
+        keyword = keyword.lower()
+        if keyword not in self.first_offsets:
+            return []
+        if keyword not in self._offsets:
+            offsets = []
+            start = self.first_offsets[keyword]
+            while start >= 0:
+                offsets.append(start)
+                start = self._text.find(keyword, start + 1)
+            self._offsets[keyword] = offsets
+        return self._offsets[keyword]
+
+    def count(self, keyword: str) -> int:
+        """Number of (possibly overlapping) occurrences of a keyword"""
+        return len(self.positions(keyword))
+
+    def counts(self) -> Dict[str, int]:
+        return {keyword: self.count(keyword) for keyword in self.first_offsets}
+
+    def found(self, category: str) -> List[str]:
+        """Keywords of a category present in the text, in vocabulary order"""
+        return [
+            keyword for keyword in self._matcher.vocabularies[category]
+            if keyword.lower() in self.first_offsets
+        ]
+
+
+class KeywordMatcher:
+    """Locate the keywords of several vocabularies in a text with one shared scan per text.
+
+    Vocabularies are merged into one deduplicated keyword table that is
+    searched once per text (rather than once per vocabulary and scorer):
+    one native ``str.find`` per keyword, skipping a keyword when a shorter
+    keyword it contains is absent. ``str.find`` keeps the semantics identical
+    to ``keyword in text`` and outpaces a single combined regex over the table.
+    """
+
+    def __init__(self, vocabularies: Dict[str, Sequence[str]]):
+        self.vocabularies = {category: list(words) for category, words in vocabularies.items()}
+
+        keywords = {word.lower() for words in self.vocabularies.values() for word in words if word}
+        # Shorter keywords first, so containment checks only look backwards
+        self._keywords = sorted(keywords, key=lambda keyword: (len(keyword), keyword))
+        self._contains = {
+            keyword: [other for other in self._keywords if other != keyword and other in keyword]
+            for keyword in self._keywords
+        }
+
+    def scan(self, text: str) -> KeywordHits:
+        """Locate every vocabulary keyword present in ``text``"""
+        first_offsets: Dict[str, int] = {}
+        find = text.find
+        for keyword in self._keywords:
+            if any(other not in first_offsets for other in self._contains[keyword]):
+                continue
+            start = find(keyword)
+            if start >= 0:
+                first_offsets[keyword] = start
+        return KeywordHits(self, text, first_offsets)
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(key: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> KeywordMatcher:
+    return KeywordMatcher(dict(key))
+
+
+def get_keyword_matcher(vocabularies: Dict[str, Sequence[str]]) -> KeywordMatcher:
+    """Return a compiled matcher for the vocabularies, reusing an earlier build"""
+    key = tuple((category, tuple(words)) for category, words in vocabularies.items())
+    return _cached_matcher(key)
@@ -0,0 +1,14 @@
+from ..core.config import settings
+from .content_cache import TieredCache
+from .resume_parser import ResumeParser
+
+parse_cache = TieredCache(
+    "parse",
+    memory_entries=settings.PARSE_CACHE_MEMORY_ENTRIES,
+    disk_path=settings.PARSE_CACHE_PATH or None,
+    max_disk_bytes=settings.PARSE_CACHE_MAX_BYTES
+)
+
+def parse_cache_key(file_type: str, sha256: str) -> str:
+    """Cache key for an uploaded document: content hash plus parser version"""
+    return f"{sha256}:{file_type}:{ResumeParser.VERSION}"
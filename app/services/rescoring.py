@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+from sqlalchemy import bindparam, func, or_, update
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.write_batcher import write_batcher
+from ..models import AnalysisResult, Resume
+from .ai_analyzer import AIAnalyzer
+from .analysis_cache import ANALYSIS_VERSION
+from .analysis_queue import analysis_columns, refresh_analysis
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisRescorer:
+    """Background re-scoring of stored analyses made by an older analyzer or vocabulary.
+
+    Stale analysis_results are streamed in id order, one chunk at a time, in a
+    worker thread. Each chunk recomputes only what changed (see
+    refresh_analysis) and is written as one batched UPDATE. After a chunk the
+    rescorer sleeps long enough to keep its share of wall time at
+    ``duty_cycle``, so a loaded server, where chunks run slower, is given
+    proportionally longer pauses.
+    """
+
+    def __init__(self, chunk_size: int, duty_cycle: float):
+        self.chunk_size = chunk_size
+        self.duty_cycle = min(max(duty_cycle, 0.01), 1.0)
+        self._task: Optional[asyncio.Task] = None
+        self._reset()
+
+    def _reset(self):
+        self.state = "idle"
+        self.total = 0
+        self.processed = 0
+        self.counts = {"cached": 0, "partial": 0, "full": 0}
+        self.failed = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._busy_seconds = 0.0
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._reset()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        self.state = "running"
+        self.started_at = time.time()
+        try:
+            self.total = await asyncio.to_thread(self._count_stale)
+            last_id = 0
+            while True:
+                started = time.perf_counter()
+                last_id = await asyncio.to_thread(self._rescore_chunk, last_id)
+                elapsed = time.perf_counter() - started
+                self._busy_seconds += elapsed
+                if last_id is None:
+                    break
+                await asyncio.sleep(elapsed * (1 - self.duty_cycle) / self.duty_cycle)
+            self.state = "done"
+        except asyncio.CancelledError:
+            self.state = "stopped"
+            raise
+        except Exception:
+            self.state = "failed"
+            logger.exception("Error rescoring analyses")
+        finally:
+            self.finished_at = time.time()
+
+    @staticmethod
+    def _stale():
+        return or_(AnalysisResult.analyzer_version.is_(None), AnalysisResult.analyzer_version != ANALYSIS_VERSION)
+
+    def _count_stale(self) -> int:
+        db = SessionLocal()
+        try:
+            return db.query(func.count(AnalysisResult.id)).filter(self._stale()).scalar()
+        finally:
+            db.close()
+
+    def _rescore_chunk(self, after_id: int) -> Optional[int]:
+        """Re-score the next chunk of stale results; returns the last id seen, or None when finished"""
+        db = SessionLocal()
+        try:
+            results = db.query(AnalysisResult).filter(
+                AnalysisResult.id > after_id,
+                self._stale()
+            ).order_by(AnalysisResult.id).limit(self.chunk_size).all()
+            if not results:
+                return None
+
+            resumes = {
+                resume.id: resume
+                for resume in db.query(Resume).filter(Resume.id.in_([result.resume_id for result in results]))
+            }
+            analyzer = AIAnalyzer()
+            updates = []
+            for result in results:
+                try:
+                    analysis, mode = refresh_analysis(db, analyzer, resumes[result.resume_id], result)
+                except Exception:
+                    self.failed += 1
+                    logger.exception("Error rescoring analysis %s", result.id)
+                    continue
+                updates.append({"result_id": result.id, **analysis_columns(analysis)})
+                self.counts[mode] += 1
+            db.commit()  # skill vectors re-encoded under a new vocabulary
+
+            if updates:
+                table = AnalysisResult.__table__
+                statement = update(table).where(table.c.id == bindparam("result_id")).values(analyzed_at=func.now())
+                write_batcher.run_blocking(lambda session: session.execute(statement, updates))
+            self.processed += len(results)
+            return results[-1].id
+        finally:
+            db.close()
+
+    def progress(self) -> Dict[str, Any]:
+        finished = self.finished_at or time.time()
+        elapsed = finished - self.started_at if self.started_at else 0.0
+        return {
+            "state": self.state,
+            "analyzer_version": ANALYSIS_VERSION,
+            "total": self.total,
+            "processed": self.processed,
+            "remaining": max(self.total - self.processed, 0),
+            "percent": round(100 * self.processed / self.total, 1) if self.total else 100.0,
+            "cached": self.counts["cached"],
+            "partial": self.counts["partial"],
+            "full": self.counts["full"],
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 2),
+            "busy_seconds": round(self._busy_seconds, 2),
+            "rows_per_second": round(self.processed / elapsed, 1) if elapsed else 0.0
+        }
+
+
+analysis_rescorer = AnalysisRescorer(chunk_size=settings.RESCORE_CHUNK_SIZE, duty_cycle=settings.RESCORE_DUTY_CYCLE)
@@ -1,19 +1,100 @@
 import re
 import json
-from typing import Dict, Any, List
+from bisect import bisect_right
+from io import BytesIO
+from typing import Dict, Any, List, BinaryIO, Optional, Union
 from PyPDF2 import PdfReader
 from docx import Document
+from .keyword_matcher import KeywordHits, get_keyword_matcher
+
+EDUCATION_KEYWORDS = [
+    "Bachelor", "Master", "PhD", "Doctorate", "MBA", "B.S.", "M.S.", 
+    "B.Sc", "M.Sc", "University", "College", "Institute", "School"
+]
+
+# Common tech skills and keywords
+SKILL_KEYWORDS = [
+    "Python", "Java", "JavaScript", "React", "Node.js", "SQL", "MongoDB",
+    "AWS", "Docker", "Kubernetes", "Git", "Machine Learning", "AI",
+    "Data Science", "TensorFlow", "PyTorch", "HTML", "CSS", "TypeScript",
+    "Angular", "Vue.js", "Express", "Django", "Flask", "PostgreSQL",
+    "MySQL", "Redis", "Elasticsearch", "Jenkins", "CI/CD", "Agile",
+    "Scrum", "REST API", "GraphQL", "Microservices", "DevOps"
+]
+
+EXPERIENCE_KEYWORDS = [
+    "experience", "work", "job", "position", "role", "company",
+    "employment", "career", "professional", "intern", "developer"
+]
+
+PROJECT_KEYWORDS = ["project", "portfolio", "developed", "built", "created", "designed"]
+
+CERTIFICATION_KEYWORDS = ["certified", "certification", "certificate", "license", "aws certified", "google certified"]
+
+class LineTable:
+    """A resume tokenized once into lines, shared by every section extractor.
+
+    Holds the raw, stripped and lowercased form of each line, the offset of
+    each line inside the lowercased text, and a single keyword scan of the
+    whole document.
+    """
+    
+    def __init__(self, text: str):
+        self.lines = text.split('\n')
+        self.stripped = [line.strip() for line in self.lines]
+        self.lower = [line.lower() for line in self.lines]
+        self.text_lower = '\n'.join(self.lower)
+        
+        self.offsets = []
+        offset = 0
+        for line in self.lower:
+            self.offsets.append(offset)
+            offset += len(line) + 1
+        
+        self.hits: KeywordHits = get_keyword_matcher({
+            "education": EDUCATION_KEYWORDS,
+            "skills": SKILL_KEYWORDS,
+            "experience": EXPERIENCE_KEYWORDS,
+            "projects": PROJECT_KEYWORDS,
+            "certifications": CERTIFICATION_KEYWORDS
+        }).scan(self.text_lower)
+    
+    def keyword_lines(self, keywords: List[str]) -> List[int]:
+        """Indexes of the lines containing any of the keywords, in order"""
+        line_indexes = set()
+        for keyword in keywords:
+            for position in self.hits.positions(keyword):
+                line_indexes.add(bisect_right(self.offsets, position) - 1)
+        return sorted(line_indexes)
+    
+    def context(self, i: int, following: int, max_length: int) -> str:
+        """A keyword line joined with the short, non-empty lines after it"""
+        parts = [self.stripped[i]]
+        for next_line in self.stripped[i + 1:i + 1 + following]:
+            if next_line and len(next_line) < max_length:
+                parts.append(next_line)
+            else:
+                break
+        return " ".join(parts)
+
 
 class ResumeParser:
+    # Bump whenever extraction or parsing output changes, to invalidate cached parses
+    VERSION = "1"
+    
     def __init__(self):
         self.email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
         self.phone_pattern = r'\b(?:\+?(\d{1,3})?)?[-. (]*(\d{3})[-. )]*(\d{3})[-. ]*(\d{4})\b'
         
-    def extract_text_from_pdf(self, pdf_content: bytes) -> str:
-        """Extract text from PDF file"""
+    @staticmethod
+    def _as_stream(content: Union[bytes, BinaryIO]) -> BinaryIO:
+        # BytesIO shares the bytes buffer, so neither branch copies the document
+        return BytesIO(content) if isinstance(content, bytes) else content
+    
+    def extract_text_from_pdf(self, pdf_content: Union[bytes, BinaryIO]) -> str:
+        """Extract text from PDF file (bytes or a binary file object)"""
         try:
-            from io import BytesIO
-            reader = PdfReader(BytesIO(pdf_content))
+            reader = PdfReader(self._as_stream(pdf_content))
             text = ""
             for page in reader.pages:
                 text += page.extract_text()
@@ -21,11 +102,10 @@ class ResumeParser:
         except Exception as e:
             raise Exception(f"Error parsing PDF: {str(e)}")
     
-    def extract_text_from_docx(self, docx_content: bytes) -> str:
-        """Extract text from DOCX file"""
+    def extract_text_from_docx(self, docx_content: Union[bytes, BinaryIO]) -> str:
+        """Extract text from DOCX file (bytes or a binary file object)"""
         try:
-            from io import BytesIO
-            doc = Document(BytesIO(docx_content))
+            doc = Document(self._as_stream(docx_content))
             text = ""
             for paragraph in doc.paragraphs:
                 text += paragraph.text + "\n"
@@ -35,24 +115,24 @@ class ResumeParser:
     
     def parse_resume_text(self, text: str) -> Dict[str, Any]:
         """Parse resume text into structured data"""
+        table = LineTable(text)
         parsed_data = {
-            "name": self._extract_name(text),
+            "name": self._extract_name(text, table),
             "email": self._extract_email(text),
             "phone": self._extract_phone(text),
-            "education": self._extract_education(text),
-            "skills": self._extract_skills(text),
-            "experience": self._extract_experience(text),
-            "projects": self._extract_projects(text),
-            "certifications": self._extract_certifications(text)
+            "education": self._extract_education(text, table),
+            "skills": self._extract_skills(text, table),
+            "experience": self._extract_experience(text, table),
+            "projects": self._extract_projects(text, table),
+            "certifications": self._extract_certifications(text, table)
         }
         return parsed_data
     
-    def _extract_name(self, text: str) -> str:
+    def _extract_name(self, text: str, table: Optional[LineTable] = None) -> str:
         """Extract name from resume text"""
-        lines = text.split('\n')
+        lines = table.stripped if table else [line.strip() for line in text.split('\n', 5)]
         # Usually name is in the first few lines
-        for i, line in enumerate(lines[:5]):
-            line = line.strip()
+        for line in lines[:5]:
             if len(line.split()) >= 2 and len(line) < 50:
                 # Check if it looks like a name (no numbers, special chars)
                 if not re.search(r'\d|@|\.com|\.edu', line):
@@ -69,107 +149,36 @@ class ResumeParser:
         match = re.search(self.phone_pattern, text)
         return match.group() if match else ""
     
-    def _extract_education(self, text: str) -> List[str]:
+    def _extract_education(self, text: str, table: Optional[LineTable] = None) -> List[str]:
         """Extract education information"""
-        education_keywords = [
-            "Bachelor", "Master", "PhD", "Doctorate", "MBA", "B.S.", "M.S.", 
-            "B.Sc", "M.Sc", "University", "College", "Institute", "School"
-        ]
-        
-        education_lines = []
-        lines = text.split('\n')
-        
-        for i, line in enumerate(lines):
-            if any(keyword.lower() in line.lower() for keyword in education_keywords):
-                # Get this line and next few lines for context
-                context = line.strip()
-                for j in range(1, 4):
-                    if i + j < len(lines):
-                        next_line = lines[i + j].strip()
-                        if next_line and len(next_line) < 200:
-                            context += " " + next_line
-                        else:
-                            break
-                education_lines.append(context)
-        
-        return education_lines[:5]  # Limit to top 5 education entries
+        table = table or LineTable(text)
+        # The first 5 matching lines, each with the next few lines for context
+        education_lines = [table.context(i, 3, 200) for i in table.keyword_lines(EDUCATION_KEYWORDS)[:5]]
+        return education_lines
     
-    def _extract_skills(self, text: str) -> List[str]:
+    def _extract_skills(self, text: str, table: Optional[LineTable] = None) -> List[str]:
         """Extract skills from resume text"""
-        # Common tech skills and keywords
-        tech_skills = [
-            "Python", "Java", "JavaScript", "React", "Node.js", "SQL", "MongoDB",
-            "AWS", "Docker", "Kubernetes", "Git", "Machine Learning", "AI",
-            "Data Science", "TensorFlow", "PyTorch", "HTML", "CSS", "TypeScript",
-            "Angular", "Vue.js", "Express", "Django", "Flask", "PostgreSQL",
-            "MySQL", "Redis", "Elasticsearch", "Jenkins", "CI/CD", "Agile",
-            "Scrum", "REST API", "GraphQL", "Microservices", "DevOps"
-        ]
-        
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in tech_skills:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
-        
+        table = table or LineTable(text)
+        found_skills = [skill for skill in SKILL_KEYWORDS if skill in table.hits]
         return list(set(found_skills))  # Remove duplicates
     
-    def _extract_experience(self, text: str) -> List[str]:
+    def _extract_experience(self, text: str, table: Optional[LineTable] = None) -> List[str]:
         """Extract work experience"""
-        experience_keywords = [
-            "experience", "work", "job", "position", "role", "company",
-            "employment", "career", "professional", "intern", "developer"
-        ]
-        
-        experience_lines = []
-        lines = text.split('\n')
-        
-        for i, line in enumerate(lines):
-            if any(keyword.lower() in line.lower() for keyword in experience_keywords):
-                # Get context around experience mentions
-                context = line.strip()
-                for j in range(1, 6):
-                    if i + j < len(lines):
-                        next_line = lines[i + j].strip()
-                        if next_line and len(next_line) < 300:
-                            context += " " + next_line
-                        else:
-                            break
-                experience_lines.append(context)
-        
-        return experience_lines[:5]  # Limit to top 5 experience entries
+        table = table or LineTable(text)
+        # Context around the first 5 experience mentions
+        experience_lines = [table.context(i, 5, 300) for i in table.keyword_lines(EXPERIENCE_KEYWORDS)[:5]]
+        return experience_lines
     
-    def _extract_projects(self, text: str) -> List[str]:
+    def _extract_projects(self, text: str, table: Optional[LineTable] = None) -> List[str]:
         """Extract project information"""
-        project_keywords = ["project", "portfolio", "developed", "built", "created", "designed"]
-        
-        project_lines = []
-        lines = text.split('\n')
-        
-        for i, line in enumerate(lines):
-            if any(keyword.lower() in line.lower() for keyword in project_keywords):
-                context = line.strip()
-                for j in range(1, 4):
-                    if i + j < len(lines):
-                        next_line = lines[i + j].strip()
-                        if next_line and len(next_line) < 200:
-                            context += " " + next_line
-                        else:
-                            break
-                project_lines.append(context)
-        
-        return project_lines[:5]  # Limit to top 5 projects
+        table = table or LineTable(text)
+        # Top 5 projects
+        project_lines = [table.context(i, 3, 200) for i in table.keyword_lines(PROJECT_KEYWORDS)[:5]]
+        return project_lines
     
-    def _extract_certifications(self, text: str) -> List[str]:
+    def _extract_certifications(self, text: str, table: Optional[LineTable] = None) -> List[str]:
         """Extract certifications"""
-        cert_keywords = ["certified", "certification", "certificate", "license", "aws certified", "google certified"]
-        
-        cert_lines = []
-        lines = text.split('\n')
-        
-        for line in lines:
-            if any(keyword.lower() in line.lower() for keyword in cert_keywords):
-                cert_lines.append(line.strip())
-        
-        return cert_lines[:5]  # Limit to top 5 certifications
+        table = table or LineTable(text)
+        # Top 5 certifications
+        cert_lines = [table.stripped[i] for i in table.keyword_lines(CERTIFICATION_KEYWORDS)[:5]]
+        return cert_lines
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import threading
+from typing import Dict, List, Set, Tuple
+from sqlalchemy import func, insert, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..models import Resume, Skill, SkillPosting
+from .ai_analyzer import AIAnalyzer
+from .keyword_matcher import get_keyword_matcher
+from .resume_parser import SKILL_KEYWORDS
+
+
+class SkillVocabulary:
+    """Normalized skill vocabulary with stable integer ids stored in the skills table.
+
+    Each resume keeps a bitset of the vocabulary skills its text mentions, so
+    matching and analysis can read skills without re-scanning the text. The
+    bitset records which vocabulary version produced it and is recomputed
+    lazily once the vocabulary changes. Ids are never reused, so bits written
+    under an older vocabulary still decode to the right names.
+
+    The same bits feed an inverted index (skill_postings) from skill id to
+    resume id, which answers "which resumes mention these skills" without
+    touching resume rows.
+
+    Methods take a sync Session; request handlers call them through
+    ``AsyncSession.run_sync`` so the queries still run on the async engine.
+    """
+
+    def __init__(self, names: List[str]):
+        self.names: List[str] = []
+        for name in names:
+            name = name.lower()
+            if name not in self.names:
+                self.names.append(name)
+        self.version = hashlib.sha1(json.dumps(self.names).encode("utf-8")).hexdigest()[:12]
+        self._ids: Dict[str, int] = {}
+        self._names_by_id: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def load(self, db: Session):
+        """Make sure every vocabulary name has a row and an id (once per process)"""
+        if self._ids:
+            return
+        # Query outside the lock: request handlers get here through run_sync on
+        # the event loop thread, where waiting on a lock held by another
+        # request's suspended greenlet would deadlock. Concurrent first loads read the same rows.
+        for _ in range(3):
+            rows = {skill.name: skill.id for skill in db.query(Skill).all()}
+            missing = [name for name in self.names if name not in rows]
+            if not missing:
+                break
+            db.add_all([Skill(name=name) for name in missing])
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another worker inserted the same names first; reload
+                db.rollback()
+        else:
+            # The last attempt's inserts (or another worker's) are not in rows yet
+            rows = {skill.name: skill.id for skill in db.query(Skill).all()}
+            missing = [name for name in self.names if name not in rows]
+            if missing:
+                raise RuntimeError(f"Could not create skill vocabulary rows for: {', '.join(missing)}")
+        ids = {name: rows[name] for name in self.names}
+        names_by_id = {skill_id: name for name, skill_id in rows.items()}
+        with self._lock:
+            if not self._ids:
+                self._names_by_id = names_by_id
+                self._ids = ids
+
+    def skill_ids(self, db: Session, names: List[str]) -> List[int]:
+        """Ids of the given skill names (names outside the vocabulary are ignored)"""
+        self.load(db)
+        return [self._ids[name.lower()] for name in names if name.lower() in self._ids]
+
+    def skill_mask(self, db: Session, names: List[str]) -> int:
+        """Bitmask of the given skill names (names outside the vocabulary are ignored)"""
+        self.load(db)
+        mask = 0
+        for name in names:
+            skill_id = self._ids.get(name.lower())
+            if skill_id is not None:
+                mask |= 1 << skill_id
+        return mask
+
+    def encode(self, db: Session, resume_text: str) -> str:
+        """Bitset (as hex) of the vocabulary skills mentioned in the text"""
+        self.load(db)
+        hits = get_keyword_matcher({"skills": self.names}).scan(resume_text.lower())
+        bits = 0
+        for name in hits.found("skills"):
+            bits |= 1 << self._ids[name]
+        return format(bits, "x")
+
+    def decode(self, skill_bits: str) -> Set[str]:
+        bits = int(skill_bits, 16)
+        return {name for skill_id, name in self._names_by_id.items() if bits >> skill_id & 1}
+
+    def index_resume(self, db: Session, user_id: int, resume_id: int, skill_bits: str):
+        """Replace a resume's postings in the inverted skill index (caller commits)"""
+        self.load(db)
+        db.query(SkillPosting).filter(SkillPosting.resume_id == resume_id).delete(synchronize_session=False)
+        bits = int(skill_bits, 16)
+        postings = [
+            {"user_id": user_id, "skill_id": skill_id, "resume_id": resume_id}
+            for skill_id in self._names_by_id if bits >> skill_id & 1
+        ]
+        if postings:
+            db.execute(insert(SkillPosting), postings)
+
+    def unindex_resume(self, db: Session, resume_id: int):
+        db.query(SkillPosting).filter(SkillPosting.resume_id == resume_id).delete(synchronize_session=False)
+
+    def is_current(self, resume: Resume) -> bool:
+        return resume.skill_bits is not None and resume.skill_vocab_version == self.version
+
+    def refresh(self, db: Session, resume: Resume) -> bool:
+        """Recompute a resume's bitset if it predates the current vocabulary"""
+        if self.is_current(resume):
+            return False
+        resume.skill_bits = self.encode(db, resume.resume_text)
+        resume.skill_vocab_version = self.version
+        self.index_resume(db, resume.user_id, resume.id, resume.skill_bits)
+        return True
+
+    def refresh_user(self, db: Session, user_id: int):
+        """Re-index every resume of a user whose bitset predates the vocabulary"""
+        stale = db.query(Resume).filter(
+            Resume.user_id == user_id,
+            or_(Resume.skill_vocab_version.is_(None), Resume.skill_vocab_version != self.version)
+        ).all()
+        for resume in stale:
+            self.refresh(db, resume)
+        if stale:
+            db.commit()
+
+    def search(self, db: Session, user_id: int, skill_ids: List[int], top_k: int, require_all: bool = False) -> List[Tuple[int, int]]:
+        """(resume_id, matched skill count) for a user's resumes, most matches first.
+        
+        Merges the posting lists of the skills; with ``require_all`` only
+        resumes in every list (their intersection) are returned.
+        """
+        matched = func.count(SkillPosting.skill_id).label("matched")
+        query = db.query(SkillPosting.resume_id, matched).filter(
+            SkillPosting.user_id == user_id,
+            SkillPosting.skill_id.in_(skill_ids)
+        ).group_by(SkillPosting.resume_id)
+        if require_all:
+            query = query.having(matched == len(set(skill_ids)))
+        rows = query.order_by(matched.desc(), SkillPosting.resume_id.desc()).limit(top_k).all()
+        return [(row.resume_id, row.matched) for row in rows]
+
+    def matched_skills(self, db: Session, resume_ids: List[int], skill_ids: List[int]) -> Dict[int, Set[str]]:
+        """Normalized names of the given skills each resume mentions"""
+        self.load(db)
+        postings = db.query(SkillPosting.resume_id, SkillPosting.skill_id).filter(
+            SkillPosting.resume_id.in_(resume_ids),
+            SkillPosting.skill_id.in_(skill_ids)
+        ).all()
+        matched: Dict[int, Set[str]] = {resume_id: set() for resume_id in resume_ids}
+        for posting in postings:
+            matched[posting.resume_id].add(self._names_by_id[posting.skill_id])
+        return matched
+
+    def resume_skills(self, db: Session, resume: Resume) -> Set[str]:
+        """Normalized skill names of a resume, refreshing a stale bitset (caller commits)"""
+        self.load(db)
+        self.refresh(db, resume)
+        return self.decode(resume.skill_bits)
+
+
+skill_vocabulary = SkillVocabulary(AIAnalyzer().skill_keywords + SKILL_KEYWORDS)
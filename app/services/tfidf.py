@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter
+from itertools import chain, repeat
+from typing import Dict, List, Optional
+import numpy as np
+from scipy import sparse
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.write_batcher import write_batcher
+from ..models import CorpusSnapshot, CorpusTerm, Resume
+
+logger = logging.getLogger(__name__)
+
+# Words, keeping the punctuation inside skill names (c++, c#, node.js, ci/cd)
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./][a-z0-9+#]+)*")
+
+STOP_WORDS = frozenset("""
+a about above after all also am an and any are as at be been being both but by can could did do does
+doing during each etc for from further had has have having he her here hers him his how i if in into is
+it its just me more most my no nor not of on once only or other our ours out over own per same she
+should so some such than that the their theirs them then there these they this those through to too
+under until up us very via was we were what when where which while who whom why will with within
+without would you your yours
+""".split())
+
+
+def term_counts(text: str) -> Dict[str, int]:
+    """Occurrences of each non-stop-word token of a text"""
+    return dict(Counter(token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS))
+
+
+class IdfTable:
+    """Smoothed inverse document frequencies of one corpus snapshot, one column per term"""
+
+    def __init__(self, snapshot_id: Optional[int], documents: int, document_counts: Dict[str, int]):
+        self.snapshot_id = snapshot_id
+        self.documents = documents
+        self.columns: Dict[str, int] = {term: column for column, term in enumerate(document_counts)}
+        counts = np.fromiter(document_counts.values(), dtype=np.float64, count=len(document_counts))
+        self.weights = np.log((1 + documents) / (1 + counts)) + 1
+        # Terms the snapshot has not seen weigh as much as the rarest ones
+        self.unseen_weight = math.log(1 + documents) + 1
+
+
+def tfidf_matrix(idf: IdfTable, documents: List[Dict[str, int]], extra_columns: Optional[Dict[str, int]] = None) -> sparse.csr_matrix:
+    """L2-normalized sublinear TF-IDF rows, one per document.
+
+    Terms outside the snapshot weigh ``unseen_weight``; they get a column only
+    if listed in ``extra_columns`` and otherwise just count towards the row's
+    norm.
+    """
+    extra_columns = extra_columns or {}
+    lengths = np.fromiter(map(len, documents), dtype=np.int64, count=len(documents))
+    terms = list(chain.from_iterable(documents))
+    columns = np.fromiter(map(idf.columns.get, terms, repeat(-1)), dtype=np.int64, count=len(terms))
+    tf = np.fromiter(chain.from_iterable(map(dict.values, documents)), dtype=np.float64, count=len(terms))
+
+    weights = np.full(len(terms), idf.unseen_weight)
+    known = columns >= 0
+    weights[known] = idf.weights[columns[known]]
+    if extra_columns:
+        unseen = np.flatnonzero(~known)
+        columns[unseen] = np.fromiter(
+            map(extra_columns.get, (terms[i] for i in unseen), repeat(-1)), dtype=np.int64, count=len(unseen)
+        )
+        known = columns >= 0
+    values = (1 + np.log(tf)) * weights
+
+    # Row norms over every term, then drop the entries without a column
+    rows = np.repeat(np.arange(len(documents)), lengths)
+    norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(documents)))
+    values = values / np.where(norms > 0, norms, 1)[rows]
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(rows[known], minlength=len(documents)))))
+    return sparse.csr_matrix(
+        (values[known], columns[known], indptr),
+        shape=(len(documents), len(idf.columns) + len(extra_columns))
+    )
+
+
+def cosine_scores(idf: IdfTable, query: Dict[str, int], documents: List[Dict[str, int]]) -> np.ndarray:
+    """Cosine similarity of the query against every document, in one sparse matrix-vector product"""
+    if not documents or not query:
+        return np.zeros(len(documents))
+    # Query terms newer than the snapshot still match resumes that contain them
+    unseen = [term for term in query if term not in idf.columns]
+    extra_columns = {term: len(idf.columns) + offset for offset, term in enumerate(unseen)}
+    query_vector = tfidf_matrix(idf, [query], extra_columns).toarray().ravel()
+    return tfidf_matrix(idf, documents, extra_columns) @ query_vector
+
+
+class TfidfMatcher:
+    """TF-IDF cosine similarity between job descriptions and resumes.
+
+    Resumes keep raw term counts, computed at upload and lazily recomputed
+    when the tokenizer VERSION changes. Document frequencies live in the
+    corpus_terms table, rebuilt from those counts by ``rebuild``; each process
+    loads the newest snapshot into an IdfTable and re-checks for a newer one
+    at most every ``idf_ttl_seconds``.
+
+    Methods take a sync Session; request handlers call them through
+    ``AsyncSession.run_sync``.
+    """
+
+    VERSION = "1"
+
+    def __init__(self, idf_ttl_seconds: float):
+        self.idf_ttl_seconds = idf_ttl_seconds
+        self._idf: Optional[IdfTable] = None
+        self._idf_checked = 0.0
+        self._lock = threading.Lock()
+
+    def is_current(self, resume: Resume) -> bool:
+        return resume.term_counts is not None and resume.term_counts_version == self.VERSION
+
+    def refresh(self, db: Session, resume: Resume) -> bool:
+        """Recompute a resume's term counts if they predate the tokenizer (caller commits)"""
+        if self.is_current(resume):
+            return False
+        resume.term_counts = term_counts(resume.resume_text)
+        resume.term_counts_version = self.VERSION
+        return True
+
+    def idf(self, db: Session) -> IdfTable:
+        """IDF table of the newest corpus snapshot"""
+        now = time.monotonic()
+        if self._idf is not None and now - self._idf_checked < self.idf_ttl_seconds:
+            return self._idf
+
+        snapshot = db.query(CorpusSnapshot).order_by(CorpusSnapshot.id.desc()).first()
+        snapshot_id = snapshot.id if snapshot else None
+        idf = self._idf
+        if idf is None or idf.snapshot_id != snapshot_id:
+            # Read outside the lock: on the event loop thread (via run_sync) the
+            # query suspends this greenlet, and another request waiting on the lock would deadlock
+            document_counts = dict(db.query(CorpusTerm.term, CorpusTerm.document_count).all()) if snapshot else {}
+            idf = IdfTable(snapshot_id, snapshot.documents if snapshot else 0, document_counts)
+        with self._lock:
+            if self._idf is None or self._idf.snapshot_id != snapshot_id:
+                self._idf = idf
+            self._idf_checked = now
+        return self._idf
+
+    def prepare(self, db: Session, resumes: List[Resume]) -> IdfTable:
+        """Bring the resumes' term counts up to date and return the IDF table to score them with (caller commits)"""
+        for resume in resumes:
+            self.refresh(db, resume)
+        return self.idf(db)
+
+    def similarities(self, db: Session, job_description: str, resumes: List[Resume]) -> List[float]:
+        """Cosine similarity (0-1) of each resume to the job description (caller commits refreshed counts)"""
+        idf = self.prepare(db, resumes)
+        scores = cosine_scores(idf, term_counts(job_description), [resume.term_counts for resume in resumes])
+        return [float(score) for score in scores]
+
+    def needs_rebuild(self, db: Session) -> bool:
+        """Whether the corpus drifted from the newest snapshot enough to rebuild it"""
+        snapshot = db.query(CorpusSnapshot).order_by(CorpusSnapshot.id.desc()).first()
+        documents = db.query(func.count(Resume.id)).scalar()
+        if snapshot is None:
+            return documents > 0
+        stale = db.query(Resume.id).filter(self._stale()).limit(1).first()
+        change = abs(documents - snapshot.documents)
+        return stale is not None or change > max(settings.CORPUS_REBUILD_MIN_CHANGE, snapshot.documents * settings.CORPUS_REBUILD_CHANGE_RATIO)
+
+    def rebuild(self, db: Session, chunk_size: int = 500) -> int:
+        """Fill in missing term counts, recount document frequencies and store a new snapshot; returns its id"""
+        # Resumes without current counts are brought up to date chunk by chunk
+        last_id = 0
+        while True:
+            resumes = db.query(Resume).filter(Resume.id > last_id, self._stale()).order_by(Resume.id).limit(chunk_size).all()
+            if not resumes:
+                break
+            for resume in resumes:
+                self.refresh(db, resume)
+            db.commit()
+            last_id = resumes[-1].id
+
+        document_counts: Counter = Counter()
+        documents = 0
+        for (counts,) in db.execute(
+            select(Resume.term_counts).where(Resume.term_counts.isnot(None)).execution_options(yield_per=chunk_size)
+        ):
+            document_counts.update(counts.keys())
+            documents += 1
+        db.commit()
+
+        def replace_terms(session):
+            session.execute(delete(CorpusTerm))
+            if document_counts:
+                session.execute(insert(CorpusTerm), [
+                    {"term": term, "document_count": count} for term, count in document_counts.items()
+                ])
+            snapshot = CorpusSnapshot(documents=documents, terms=len(document_counts))
+            session.add(snapshot)
+            session.flush()
+            return snapshot.id
+
+        return write_batcher.run_blocking(replace_terms)
+
+    def _stale(self):
+        return or_(Resume.term_counts.is_(None), Resume.term_counts_version != self.VERSION)
+
+
+class CorpusMaintainer:
+    """Background task rebuilding the corpus snapshot whenever the corpus has drifted from it"""
+
+    def __init__(self, matcher: TfidfMatcher, interval_seconds: float):
+        self.matcher = matcher
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self._maintain)
+            except Exception:
+                logger.exception("Error rebuilding corpus frequencies")
+            await asyncio.sleep(self.interval_seconds)
+
+    def _maintain(self):
+        db = SessionLocal()
+        try:
+            if self.matcher.needs_rebuild(db):
+                self.matcher.rebuild(db)
+        finally:
+            db.close()
+
+
+tfidf_matcher = TfidfMatcher(idf_ttl_seconds=settings.CORPUS_IDF_TTL_SECONDS)
+corpus_maintainer = CorpusMaintainer(tfidf_matcher, interval_seconds=settings.CORPUS_REBUILD_INTERVAL_SECONDS)
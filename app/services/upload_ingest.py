@@ -0,0 +1,125 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, List, Optional, Union
+from fastapi import UploadFile
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the configured maximum size"""
+
+
+class IngestedUpload:
+    """An uploaded document held in exactly one buffer, plus its SHA-256.
+
+    Small files stay in memory as a single ``bytes`` object. Larger files are
+    spooled to a named temporary file and handed to the parser by path, so the
+    worker process reads them straight from disk instead of receiving a pickled
+    copy of the bytes.
+    """
+
+    def __init__(self, sha256: str, size: int, data: Optional[bytes] = None, path: Optional[str] = None):
+        self.sha256 = sha256
+        self.size = size
+        self.data = data
+        self.path = path
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """The document bytes, or the path of the spooled file"""
+        return self.path if self.path is not None else self.data
+
+    def close(self):
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+        self.data = None
+
+
+class _Ingester:
+    """Hashes chunks as they stream in, enforcing the size bound and spooling past the threshold"""
+
+    def __init__(self, max_bytes: int, spool_threshold: int):
+        self.max_bytes = max_bytes
+        self.spool_threshold = spool_threshold
+        self.digest = hashlib.sha256()
+        self.chunks: List[bytes] = []
+        self.spool = None
+        self.size = 0
+
+    def writes_to_disk(self, chunk: bytes) -> bool:
+        """Whether adding the chunk goes to (or starts) the spool file"""
+        return self.spool is not None or self.size + len(chunk) > self.spool_threshold
+
+    def add(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLarge()
+        self.digest.update(chunk)
+
+        if self.spool is None and self.size > self.spool_threshold:
+            self.spool = tempfile.NamedTemporaryFile(prefix="resume-upload-", delete=False)
+            self.spool.writelines(self.chunks)
+            self.chunks = []
+        if self.spool is not None:
+            self.spool.write(chunk)
+        else:
+            self.chunks.append(chunk)
+
+    def abort(self):
+        if self.spool is not None:
+            self.spool.close()
+            os.unlink(self.spool.name)
+
+    def finish(self) -> IngestedUpload:
+        if self.spool is not None:
+            self.spool.close()
+            return IngestedUpload(self.digest.hexdigest(), self.size, path=self.spool.name)
+        return IngestedUpload(self.digest.hexdigest(), self.size, data=b"".join(self.chunks))
+
+
+async def ingest_upload(upload: UploadFile, max_bytes: int, spool_threshold: int, chunk_size: int) -> IngestedUpload:
+    """Read an upload in chunks, hashing it and enforcing ``max_bytes`` as it streams.
+
+    Chunks past the spool threshold are written to disk in a thread, so a
+    large upload does not block the event loop.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge()
+
+    ingester = _Ingester(max_bytes, spool_threshold)
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            if ingester.writes_to_disk(chunk):
+                await asyncio.to_thread(ingester.add, chunk)
+            else:
+                ingester.add(chunk)
+    except BaseException:
+        if ingester.spool is not None:
+            await asyncio.to_thread(ingester.abort)
+        raise
+    if ingester.spool is not None:
+        return await asyncio.to_thread(ingester.finish)
+    return ingester.finish()
+
+
+def ingest_stream(stream: BinaryIO, max_bytes: int, spool_threshold: int, chunk_size: int) -> IngestedUpload:
+    """Blocking ingest_upload for a file object (e.g. a zip archive member); run it off the event loop"""
+    ingester = _Ingester(max_bytes, spool_threshold)
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            ingester.add(chunk)
+    except BaseException:
+        ingester.abort()
+        raise
+    return ingester.finish()
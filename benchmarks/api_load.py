@@ -0,0 +1,207 @@
+"""End-to-end load test of the API through the in-process test client and a local SQLite database.
+
+Starts the app (with its startup tasks) against a throwaway SQLite file
+and drives it with ``--concurrency`` client threads through a session of:
+
+1. registering and logging in;
+2. uploading the synthetic corpus one file per request, and one batch;
+3. queueing an analysis of every resume and polling until each is done;
+4. matching resumes against job descriptions, singly and in batches;
+5. reading lists, analyses, search results and similar resumes.
+
+Every request is timed client-side; results are per endpoint (route
+template), with throughput over the phase the endpoint ran in.
+
+    python -m benchmarks.api_load --documents 20 --concurrency 8 --json api.json
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import build_corpus, job_descriptions  # noqa: E402
+from benchmarks.report import print_results, summarize, write_report  # noqa: E402
+
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+}
+
+
+def configure_environment(database_path: str):
+    """Point the app at a throwaway database and keep its caches and stores off disk (before importing it)"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ.setdefault("PARSE_CACHE_PATH", "")
+    os.environ.setdefault("ANALYSIS_CACHE_PATH", "")
+    os.environ.setdefault("EMBEDDING_STORE_PATH", "")
+    os.environ.setdefault("RESCORE_ON_STARTUP", "false")
+    # Login cost is not what this benchmark measures
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+
+class LoadRecorder:
+    """Client-side latencies and failures per endpoint, plus each phase's wall time"""
+
+    def __init__(self, client):
+        self.client = client
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.phases: Dict[str, float] = {}
+        self.endpoint_phase: Dict[str, str] = {}
+        self._phase = None
+
+    def record(self, endpoint: str, latency_ms: float, failed: bool = False):
+        self.endpoint_phase.setdefault(endpoint, self._phase)
+        self.latencies[endpoint].append(latency_ms)
+        if failed:
+            self.errors[endpoint] += 1
+
+    def request(self, endpoint: str, method: str, url: str, expected=(200,), **kwargs):
+        started = time.perf_counter()
+        response = self.client.request(method, url, **kwargs)
+        self.record(endpoint, (time.perf_counter() - started) * 1000, response.status_code not in expected)
+        return response
+
+    def phase(self, name: str, concurrency: int, tasks: List[Callable[[], object]]) -> list:
+        """Run tasks on ``concurrency`` threads and record the phase's wall time"""
+        self._phase = name
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(lambda task: task(), tasks))
+        self.phases[name] = time.perf_counter() - started
+        return outcomes
+
+    def results(self) -> list:
+        results = []
+        for endpoint, latencies in self.latencies.items():
+            wall = self.phases.get(self.endpoint_phase[endpoint]) or sum(latencies) / 1000
+            results.append(summarize(
+                f"api {endpoint}", latencies,
+                phase=self.endpoint_phase[endpoint],
+                errors=self.errors[endpoint],
+                requests_per_second=round(len(latencies) / wall, 2) if wall else None
+            ))
+        return results
+
+
+def run(documents: int, concurrency: int, batch_matches: int, seed: int = 0) -> list:
+    with tempfile.TemporaryDirectory() as directory:
+        configure_environment(os.path.join(directory, "load.db"))
+        from fastapi.testclient import TestClient
+        import main as application
+
+        corpus = build_corpus(max(documents // 6, 1), seed)[:documents]
+        batch = build_corpus(2, seed + 100, sizes=["small", "medium"])[:10]
+        jds = job_descriptions(max(batch_matches, 1), seed)
+
+        with TestClient(application.app) as client:
+            load = LoadRecorder(client)
+
+            def headers() -> dict:
+                return {"Authorization": f"Bearer {token}"}
+
+            load.phase("register", 1, [lambda: load.request(
+                "POST /api/auth/register", "POST", "/api/auth/register",
+                json={"name": "Load Test", "email": "load@example.com", "password": "benchmark-password"}
+            )])
+            token = load.phase("login", 1, [lambda: load.request(
+                "POST /api/auth/login", "POST", "/api/auth/login",
+                json={"email": "load@example.com", "password": "benchmark-password"}
+            )])[0].json()["access_token"]
+
+            def upload(document):
+                return load.request(
+                    "POST /api/resume/upload", "POST", "/api/resume/upload", headers=headers(),
+                    files={"file": (document.name, document.content, CONTENT_TYPES[document.file_type])}
+                )
+            uploaded = load.phase("upload", concurrency, [lambda d=d: upload(d) for d in corpus])
+            resume_ids = [response.json()["id"] for response in uploaded if response.status_code == 200]
+
+            load.phase("batch upload", 1, [lambda: load.request(
+                "POST /api/resume/upload/batch", "POST", "/api/resume/upload/batch", headers=headers(),
+                files=[("files", (d.name, d.content, CONTENT_TYPES[d.file_type])) for d in batch]
+            )])
+
+            def analyze(resume_id: int):
+                job = load.request(
+                    "POST /api/resume/analyze/{resume_id}", "POST", f"/api/resume/analyze/{resume_id}",
+                    expected=(202,), headers=headers()
+                ).json()
+                started = time.perf_counter()
+                while job.get("status") in ("pending", "running") and time.perf_counter() - started < 60:
+                    time.sleep(0.01)
+                    job = load.request(
+                        "GET /api/resume/analysis-jobs/{job_id}", "GET", f"/api/resume/analysis-jobs/{job['id']}",
+                        headers=headers()
+                    ).json()
+                load.record("analysis job completion", (time.perf_counter() - started) * 1000, job.get("status") != "done")
+            load.phase("analyze", concurrency, [lambda r=r: analyze(r) for r in resume_ids])
+
+            load.phase("match", concurrency, [
+                lambda r=r, jd=jds[i % len(jds)]: load.request(
+                    "POST /api/job/match/{resume_id}", "POST", f"/api/job/match/{r}", headers=headers(),
+                    json={"job_description": jd, "job_title": "Engineer"}
+                )
+                for i, r in enumerate(resume_ids)
+            ] + [
+                lambda jd=jd: load.request(
+                    "POST /api/job/match/batch", "POST", "/api/job/match/batch", headers=headers(),
+                    json={"job_description": jd, "job_title": "Engineer"}
+                )
+                for jd in jds[:batch_matches]
+            ])
+
+            load.phase("read", concurrency, [
+                task
+                for r in resume_ids
+                for task in (
+                    lambda: load.request("GET /api/resume/", "GET", "/api/resume/", headers=headers()),
+                    lambda r=r: load.request(
+                        "GET /api/resume/{resume_id}/analysis", "GET", f"/api/resume/{r}/analysis", headers=headers()
+                    ),
+                    lambda r=r: load.request(
+                        "GET /api/job/{resume_id}/matches", "GET", f"/api/job/{r}/matches", headers=headers()
+                    ),
+                    lambda r=r: load.request(
+                        "GET /api/resume/{resume_id}/similar", "GET", f"/api/resume/{r}/similar", headers=headers()
+                    ),
+                    lambda r=r: load.request(
+                        "POST /api/job/search", "POST", "/api/job/search", headers=headers(),
+                        json={"job_description": jds[r % len(jds)], "top_k": 10}
+                    ),
+                )
+            ])
+
+            return load.results()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=30, help="resumes uploaded one per request")
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads")
+    parser.add_argument("--batch-matches", type=int, default=5, help="batch job-match requests")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = run(args.documents, args.concurrency, args.batch_matches, args.seed)
+    print_results(results)
+    print()
+    print(f"{'endpoint':<44}{'errors':>8}{'req/s':>10}")
+    for result in results:
+        print(f"{result['name']:<44}{result['errors']:>8}{result['requests_per_second'] or 0:>10.1f}")
+    if args.json:
+        write_report(
+            args.json, results, benchmark="api_load",
+            documents=args.documents, concurrency=args.concurrency, batch_matches=args.batch_matches
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Synthetic resumes and job descriptions, as plain text, DOCX and PDF, for the benchmarks.
+
+Resumes come in three sizes that differ in how many experience, project
+and certification entries they list (from half a page to about four).
+Every document is derived from a seeded random generator, so a given seed
+always produces the same corpus and benchmark runs stay comparable.
+
+    python -m benchmarks.corpus --out /tmp/corpus --count 10
+"""
+import argparse
+import io
+import os
+import random
+import sys
+from typing import List, NamedTuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document  # noqa: E402
+
+FIRST_NAMES = ["Alex", "Priya", "Jordan", "Wei", "Maria", "Samuel", "Aisha", "Tomas", "Keiko", "Daniel"]
+LAST_NAMES = ["Johnson", "Raman", "Okafor", "Chen", "Garcia", "Novak", "Hassan", "Silva", "Tanaka", "Murphy"]
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "React", "Node.js", "Django", "Flask", "SQL", "PostgreSQL",
+    "MongoDB", "Docker", "Kubernetes", "AWS", "Azure", "Git", "Linux", "Machine Learning", "TensorFlow",
+    "Pandas", "REST", "GraphQL", "CI/CD", "Terraform", "Redis", "Kafka", "Agile", "Scrum"
+]
+TITLES = ["Software Engineer", "Backend Developer", "Data Scientist", "DevOps Engineer", "Frontend Developer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Systems"]
+ACTIONS = ["Developed", "Led", "Designed", "Implemented", "Optimized", "Managed", "Built", "Improved"]
+OBJECTS = [
+    "a payment processing service", "the customer analytics pipeline", "an internal deployment platform",
+    "a recommendation engine", "the mobile API gateway", "a real-time monitoring dashboard"
+]
+RESULTS = ["reducing latency by {n}%", "serving {n}k daily users", "cutting costs by {n}%", "improving conversion by {n}%"]
+DEGREES = ["Bachelor of Science in Computer Science", "Master of Science in Data Science", "Bachelor of Engineering"]
+CERTIFICATIONS = ["AWS Certified Solutions Architect", "Certified Kubernetes Administrator", "PMP Certification"]
+
+# Experience entries, projects and certifications per resume size
+SIZES = {"small": (2, 1, 1), "medium": (5, 3, 2), "large": (25, 12, 6)}
+
+
+class CorpusDocument(NamedTuple):
+    name: str
+    size: str
+    file_type: str
+    text: str
+    content: bytes
+
+
+def _bullet(rng: random.Random) -> str:
+    result = rng.choice(RESULTS).format(n=rng.randint(5, 90))
+    return f"- {rng.choice(ACTIONS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}, {result}"
+
+
+def resume_text(rng: random.Random, size: str = "medium") -> str:
+    """Plain-text resume with the sections ResumeParser looks for"""
+    experiences, projects, certifications = SIZES[size]
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com | +1 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "",
+        "Summary",
+        f"{rng.choice(TITLES)} with {rng.randint(2, 15)} years of experience building reliable software.",
+        "",
+        "Skills",
+        ", ".join(rng.sample(SKILLS, rng.randint(6, 14))),
+        "",
+        "Experience",
+    ]
+    for _ in range(experiences):
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} ({rng.randint(2008, 2023)} - present)")
+        lines.extend(_bullet(rng) for _ in range(rng.randint(2, 4)))
+    lines += ["", "Projects"]
+    for index in range(projects):
+        lines.append(f"Project {index + 1}: {rng.choice(OBJECTS).capitalize()}")
+        lines.append(_bullet(rng))
+    lines += ["", "Education", f"{rng.choice(DEGREES)}, State University, {rng.randint(2004, 2020)}", "", "Certifications"]
+    lines.extend(rng.sample(CERTIFICATIONS, min(certifications, len(CERTIFICATIONS))))
+    lines.extend(f"Certified {skill} Professional" for skill in rng.sample(SKILLS, max(certifications - len(CERTIFICATIONS), 0)))
+    return "\n".join(lines) + "\n"
+
+
+def job_description(rng: random.Random) -> str:
+    required = rng.sample(SKILLS, rng.randint(4, 8))
+    return (
+        f"We are hiring a {rng.choice(TITLES)} to join {rng.choice(COMPANIES)}. "
+        f"Required: {', '.join(required[:-2])}. Nice to have: {', '.join(required[-2:])}. "
+        f"You will work on {rng.choice(OBJECTS)} with an Agile team."
+    )
+
+
+def docx_bytes(text: str) -> bytes:
+    document = Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def pdf_bytes(text: str, lines_per_page: int = 50) -> bytes:
+    """Minimal multi-page PDF with the text in Helvetica, readable by PyPDF2"""
+    lines = text.splitlines() or [""]
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)]
+
+    def escape(line: str) -> str:
+        return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    # Objects 1-3 are the catalog, page tree and font; each page adds a page and a content stream
+    objects = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in pages:
+        stream = "BT /F1 10 Tf 14 TL 50 780 Td " + " ".join(f"({escape(line)}) Tj T*" for line in page) + " ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream.encode("latin-1", "replace")))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % len(objects)
+        )
+        page_ids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(page_ids)
+    )
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    output.write(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return output.getvalue()
+
+
+def build_corpus(count: int, seed: int = 0, sizes: List[str] = None, file_types: List[str] = None) -> List[CorpusDocument]:
+    """``count`` documents of every size and file type"""
+    rng = random.Random(seed)
+    documents = []
+    for size in sizes or list(SIZES):
+        for index in range(count):
+            text = resume_text(rng, size)
+            for file_type in file_types or ["pdf", "docx"]:
+                content = pdf_bytes(text) if file_type == "pdf" else docx_bytes(text)
+                documents.append(CorpusDocument(f"{size}_{index}.{file_type}", size, file_type, text, content))
+    return documents
+
+
+def job_descriptions(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed + 1)
+    return [job_description(rng) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True, help="directory to write the documents to")
+    parser.add_argument("--count", type=int, default=10, help="resumes per size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    documents = build_corpus(args.count, args.seed)
+    for document in documents:
+        with open(os.path.join(args.out, document.name), "wb") as f:
+            f.write(document.content)
+    with open(os.path.join(args.out, "job_descriptions.txt"), "w") as f:
+        f.write("\n".join(job_descriptions(args.count, args.seed)) + "\n")
+
+    print(f"{'size':<10}{'file type':<11}{'documents':>10}{'avg bytes':>12}")
+    for size in SIZES:
+        for file_type in ("pdf", "docx"):
+            matching = [d for d in documents if d.size == size and d.file_type == file_type]
+            print(f"{size:<10}{file_type:<11}{len(matching):>10}{sum(len(d.content) for d in matching) // len(matching):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Query time of the hot foreign-key lookups before and after the lookup indexes.
+
+Builds a throwaway SQLite database with the app's schema, fills it with
+``--rows`` job matches (plus a tenth as many resumes and analyses), times
+the queries behind the list/detail endpoints without the indexes added by
+migrations 3 and 4, then adds them and times the same queries again.
+List queries are the keyset pages the endpoints run: the newest
+``PAGE_SIZE_DEFAULT`` rows (plus one, to detect a next page) below a
+cursor id.
+
+    python -m benchmarks.index_lookups --rows 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, text  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base  # noqa: E402
+from app.core.migrations import add_lookup_indexes, add_pagination_indexes  # noqa: E402
+from app.models import AnalysisResult, JobMatch, Resume, User  # noqa: E402
+
+LOOKUP_INDEXES = [
+    "ix_resumes_user_id_id",
+    "ux_analysis_results_resume_id",
+    "ix_job_matches_resume_id_id"
+]
+
+QUERIES = {
+    "get_user_resumes": (
+        "SELECT * FROM resumes WHERE user_id = :user_id AND id < :resume_cursor "
+        "ORDER BY id DESC LIMIT :page"
+    ),
+    "get_resume_analysis": (
+        "SELECT * FROM analysis_results WHERE resume_id = :resume_id"
+    ),
+    "get_job_matches": (
+        "SELECT * FROM job_matches WHERE resume_id = :resume_id AND id < :match_cursor "
+        "ORDER BY id DESC LIMIT :page"
+    ),
+    "get_all_job_matches": (
+        "SELECT job_matches.* FROM job_matches JOIN resumes ON resumes.id = job_matches.resume_id "
+        "WHERE resumes.user_id = :user_id AND job_matches.id < :match_cursor "
+        "ORDER BY job_matches.id DESC LIMIT :page"
+    )
+}
+
+
+def populate(engine, rows: int, chunk: int = 50_000):
+    resumes = max(rows // 10, 1)
+    users = max(resumes // 10, 1)
+    start = datetime(2024, 1, 1)
+    rng = random.Random(42)
+
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "name": f"User {i}", "password_hash": "x"}
+            for i in range(1, users + 1)
+        ])
+        for offset in range(0, resumes, chunk):
+            ids = range(offset + 1, min(offset + chunk, resumes) + 1)
+            conn.execute(insert(Resume), [
+                {"id": i, "user_id": rng.randint(1, users), "filename": f"cv{i}.pdf", "file_type": "pdf",
+                 "resume_text": "python docker", "uploaded_at": start + timedelta(minutes=i)}
+                for i in ids
+            ])
+            conn.execute(insert(AnalysisResult), [
+                {"resume_id": i, "ats_score": 50.0, "skills": "[]", "feedback": "{}", "suggestions": "[]"}
+                for i in ids
+            ])
+        for offset in range(0, rows, chunk):
+            conn.execute(insert(JobMatch), [
+                {"resume_id": rng.randint(1, resumes), "job_description": "python developer",
+                 "match_score": 50.0, "created_at": start + timedelta(seconds=i)}
+                for i in range(offset, min(offset + chunk, rows))
+            ])
+    return users, resumes
+
+
+def time_queries(engine, users: int, resumes: int, matches: int, repeat: int) -> dict:
+    rng = random.Random(7)
+    results = {}
+    with engine.connect() as conn:
+        for name, sql in QUERIES.items():
+            timings = []
+            for _ in range(repeat):
+                params = {
+                    "user_id": rng.randint(1, users),
+                    "resume_id": rng.randint(1, resumes),
+                    # A page somewhere in the middle of the history, as reached by following cursors
+                    "resume_cursor": rng.randint(resumes // 2, resumes),
+                    "match_cursor": rng.randint(matches // 2, matches),
+                    "page": settings.PAGE_SIZE_DEFAULT + 1
+                }
+                started = time.perf_counter()
+                conn.execute(text(sql), params).all()
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = statistics.median(timings)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="job_matches rows to generate")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            for name in LOOKUP_INDEXES:
+                conn.execute(text(f"DROP INDEX {name}"))
+
+        started = time.perf_counter()
+        users, resumes = populate(engine, args.rows)
+        print(f"Populated {args.rows} job matches, {resumes} resumes, {users} users "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        before = time_queries(engine, users, resumes, args.rows, args.repeat)
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            add_lookup_indexes(conn)
+            add_pagination_indexes(conn)
+        print(f"Built lookup indexes in {time.perf_counter() - started:.1f}s")
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        after = time_queries(engine, users, resumes, args.rows, args.repeat)
+        engine.dispose()
+
+    print(f"\n{'query':<22}{'no index (ms)':>15}{'indexed (ms)':>15}{'speedup':>10}")
+    for name in QUERIES:
+        print(f"{name:<22}{before[name]:>15.3f}{after[name]:>15.3f}{before[name] / after[name]:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Micro-benchmarks of ResumeParser and AIAnalyzer on the synthetic corpus, per resume size.
+
+Times, for each resume size:
+
+* text extraction: extract_text_from_pdf and extract_text_from_docx;
+* parsing: parse_resume_text, building its LineTable, and every
+  ``_extract_*`` step on its own (given the shared LineTable, as
+  parse_resume_text calls them);
+* analysis: calculate_ats_score, analyze_resume and
+  compare_with_job_description.
+
+    python -m benchmarks.parser_analyzer --repeat 50 --json parser.json
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.ai_analyzer import AIAnalyzer  # noqa: E402
+from app.services.resume_parser import LineTable, ResumeParser  # noqa: E402
+from benchmarks.corpus import SIZES, build_corpus, job_descriptions  # noqa: E402
+from benchmarks.report import measure, print_results, summarize, write_report  # noqa: E402
+
+# Steps of parse_resume_text that use the shared LineTable
+TABLE_STEPS = [
+    "_extract_name", "_extract_education", "_extract_skills",
+    "_extract_experience", "_extract_projects", "_extract_certifications"
+]
+TEXT_STEPS = ["_extract_email", "_extract_phone"]
+
+
+def run(repeat: int, documents_per_size: int = 3, seed: int = 0) -> list:
+    """Result entries named ``<step>[<size>]``; each run covers every document of that size"""
+    parser = ResumeParser()
+    analyzer = AIAnalyzer()
+    corpus = build_corpus(documents_per_size, seed)
+    job_description = job_descriptions(1, seed)[0]
+
+    results = []
+    for size in SIZES:
+        documents = [document for document in corpus if document.size == size]
+        texts = [document.text for document in documents if document.file_type == "pdf"]
+        tables = [LineTable(text) for text in texts]
+
+        def time_step(name: str, function, unit_bytes: int = 0):
+            latencies = measure(function, repeat)
+            extra = {"size": size, "documents": len(texts)}
+            if unit_bytes:
+                extra["mb_per_second"] = round(unit_bytes / 1e6 / (sum(latencies) / len(latencies) / 1000), 3)
+            results.append(summarize(f"{name}[{size}]", latencies, **extra))
+
+        for file_type, extract in (("pdf", parser.extract_text_from_pdf), ("docx", parser.extract_text_from_docx)):
+            contents = [document.content for document in documents if document.file_type == file_type]
+            time_step(
+                f"extract_text_from_{file_type}",
+                lambda contents=contents, extract=extract: [extract(content) for content in contents],
+                unit_bytes=sum(map(len, contents))
+            )
+
+        time_step("parse_resume_text", lambda: [parser.parse_resume_text(text) for text in texts])
+        time_step("LineTable", lambda: [LineTable(text) for text in texts])
+        for step in TABLE_STEPS:
+            method = getattr(parser, step)
+            time_step(step, lambda method=method: [method(text, table) for text, table in zip(texts, tables)])
+        for step in TEXT_STEPS:
+            method = getattr(parser, step)
+            time_step(step, lambda method=method: [method(text) for text in texts])
+
+        time_step("calculate_ats_score", lambda: [analyzer.calculate_ats_score(text) for text in texts])
+        time_step("analyze_resume", lambda: [analyzer.analyze_resume(text) for text in texts])
+        time_step(
+            "compare_with_job_description",
+            lambda: [analyzer.compare_with_job_description(text, job_description) for text in texts]
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50, help="timed runs per step and size")
+    parser.add_argument("--documents", type=int, default=3, help="resumes per size in each run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.documents, args.seed)
+    print_results(results)
+    if args.json:
+        write_report(args.json, results, benchmark="parser_analyzer", repeat=args.repeat, documents=args.documents)
+
+
+if __name__ == "__main__":
+    main()
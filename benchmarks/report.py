@@ -0,0 +1,102 @@
+"""Timing helpers and the JSON result format shared by the benchmark suite.
+
+A report is ``{"environment": {...}, "results": [...]}`` where every result
+has a unique ``name`` and latency fields in milliseconds. ``compare``
+matches results by name against a baseline report to flag regressions.
+"""
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import time
+from typing import Callable, Dict, List, Optional
+
+
+def percentile(values: List[float], share: float) -> float:
+    """Nearest-rank percentile of unsorted values"""
+    ordered = sorted(values)
+    return ordered[min(max(math.ceil(len(ordered) * share) - 1, 0), len(ordered) - 1)]
+
+
+def summarize(name: str, latencies_ms: List[float], **extra) -> dict:
+    """Result entry for a list of latencies in milliseconds"""
+    return {
+        "name": name,
+        "runs": len(latencies_ms),
+        "median_ms": round(statistics.median(latencies_ms), 4),
+        "p95_ms": round(percentile(latencies_ms, 0.95), 4),
+        "p99_ms": round(percentile(latencies_ms, 0.99), 4),
+        "min_ms": round(min(latencies_ms), 4),
+        **extra
+    }
+
+
+def measure(function: Callable[[], object], repeat: int, warmup: int = 3) -> List[float]:
+    """Latencies in milliseconds of ``repeat`` calls, after ``warmup`` untimed ones"""
+    for _ in range(warmup):
+        function()
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def environment() -> dict:
+    """Where a report was produced, so reports from different machines are not compared blindly"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    }
+
+
+def write_report(path: str, results: List[dict], **extra) -> dict:
+    report = {"environment": environment(), **extra, "results": results}
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def load_report(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline: dict, current: dict, threshold: float, metric: str = "median_ms") -> List[Dict[str, Optional[float]]]:
+    """Per-result change of ``metric`` against the baseline; ``regression`` marks slowdowns beyond ``threshold``"""
+    previous = {result["name"]: result for result in baseline.get("results", [])}
+    rows = []
+    for result in current.get("results", []):
+        before = previous.get(result["name"], {}).get(metric)
+        after = result.get(metric)
+        change = (after - before) / before if before and after is not None else None
+        rows.append({
+            "name": result["name"],
+            "baseline": before,
+            "current": after,
+            "change": change,
+            "regression": change is not None and change > threshold
+        })
+    return rows
+
+
+def print_results(results: List[dict]):
+    width = max([len(result["name"]) for result in results] + [10]) + 2
+    print(f"{'benchmark':<{width}}{'runs':>7}{'median (ms)':>13}{'p95 (ms)':>11}{'p99 (ms)':>11}")
+    for result in results:
+        print(f"{result['name']:<{width}}{result['runs']:>7}{result['median_ms']:>13.3f}"
+              f"{result['p95_ms']:>11.3f}{result['p99_ms']:>11.3f}")
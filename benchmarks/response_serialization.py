@@ -0,0 +1,103 @@
+"""Per-request serialization cost of the list endpoints before and after the orjson fast path.
+
+Fills an in-memory SQLite database with job matches, reads pages of the
+projected columns the list endpoints select, and times turning a page into
+a response body both ways:
+
+* before: FastAPI's response_model path (validate every row into
+  JobMatchSummary, dump it back to JSON-compatible dicts) rendered by the
+  stdlib-json JSONResponse;
+* after: the rows' mappings rendered directly by FastJSONResponse (orjson).
+
+    python -m benchmarks.response_serialization --repeat 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from app.core.database import Base  # noqa: E402
+from app.core.json_types import dumps, loads  # noqa: E402
+from app.api.job_match import _match_columns  # noqa: E402
+from app.api.responses import rows_response  # noqa: E402
+from app.models import JobMatch, Resume, User  # noqa: E402
+from app.schemas import JobMatchSummary  # noqa: E402
+
+SKILLS = ["Python", "Docker", "Kubernetes", "Aws", "Sql", "React", "Node", "Git"]
+
+
+def build_rows(count: int, include_description: bool) -> list:
+    engine = create_engine(
+        "sqlite://", poolclass=StaticPool, json_serializer=dumps, json_deserializer=loads
+    )
+    Base.metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "email": "user@example.com", "name": "User", "password_hash": "x"}])
+        conn.execute(insert(Resume), [{"id": 1, "user_id": 1, "filename": "cv.pdf", "file_type": "pdf", "resume_text": ""}])
+        conn.execute(insert(JobMatch), [
+            {
+                "resume_id": 1,
+                "job_description": "Senior backend engineer. " * 20,
+                "job_title": f"Engineer {i}",
+                "match_score": round(100 * i / count, 1),
+                "missing_skills": SKILLS[i % 4:],
+                "overlapping_skills": SKILLS[:i % 4 + 2],
+                "suggestions": [f"Learn {skill}" for skill in SKILLS[i % 4:]],
+                "created_at": start + timedelta(seconds=i, microseconds=i)
+            }
+            for i in range(count)
+        ])
+    with engine.connect() as conn:
+        rows = conn.execute(select(*_match_columns(include_description)).order_by(JobMatch.id.desc())).all()
+    engine.dispose()
+    return rows
+
+
+async def time_page(rows: list, repeat: int) -> dict:
+    field = create_response_field(name="Response_get_all_job_matches", type_=List[JobMatchSummary])
+    before, after = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        content = await serialize_response(field=field, response_content=rows)
+        old_body = JSONResponse(content).body
+        before.append((time.perf_counter() - started) * 1_000_000)
+
+        started = time.perf_counter()
+        new_body = rows_response(rows).body
+        after.append((time.perf_counter() - started) * 1_000_000)
+
+    # Both paths must produce the same document
+    assert json.loads(old_body) == json.loads(new_body)
+    return {"before": statistics.median(before), "after": statistics.median(after), "bytes": len(new_body)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 50, 200], help="rows per page")
+    parser.add_argument("--repeat", type=int, default=500, help="timed serializations per page size")
+    args = parser.parse_args()
+
+    print(f"{'page':<24}{'bytes':>9}{'before (us)':>14}{'after (us)':>13}{'speedup':>10}")
+    for include_description in (False, True):
+        for size in args.sizes:
+            result = asyncio.run(time_page(build_rows(size, include_description), args.repeat))
+            label = f"{size} rows" + (" +description" if include_description else "")
+            print(f"{label:<24}{result['bytes']:>9}{result['before']:>14.1f}{result['after']:>13.1f}"
+                  f"{result['before'] / result['after']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Query latency and recall of the resume similarity search, exact scan vs IVF index.
+
+Embeds a synthetic corpus of resumes (each drawn from a few overlapping
+skill clusters) into an in-memory EmbeddingStore owned by one user, builds
+the IVF index over it and times top-k queries both ways:
+
+* exact: a full matrix-vector scan of the user's rows;
+* ivf: only the rows in the ``probes`` buckets nearest to the query.
+
+Recall is the share of the exact top-k the IVF search also returns.
+
+    python -m benchmarks.similarity_search --resumes 100000 --probes 4 16 32
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from app.services.embeddings import EmbeddingStore, HashingEmbedder, IvfIndex, SimilaritySearch  # noqa: E402
+
+CLUSTERS = [
+    "python django flask postgres sql rest api backend celery redis",
+    "react javascript typescript redux css html frontend webpack",
+    "kubernetes docker terraform aws devops jenkins ci/cd helm linux",
+    "machine learning pytorch tensorflow pandas numpy statistics nlp",
+    "java spring hibernate microservices kafka maven oracle",
+    "ios swift android kotlin mobile firebase",
+    "excel tableau powerbi reporting finance analytics forecasting",
+    "project management agile scrum jira stakeholder roadmap",
+]
+FILLER = "experienced team led delivered built designed improved managed developed years senior engineer".split()
+
+
+def build_corpus(count: int, seed: int) -> list:
+    rng = np.random.default_rng(seed)
+    words = [cluster.split() for cluster in CLUSTERS]
+    texts = []
+    for _ in range(count):
+        primary, secondary = rng.choice(len(CLUSTERS), 2, replace=False)
+        chosen = list(rng.choice(words[primary], 6)) + list(rng.choice(words[secondary], 2)) + list(rng.choice(FILLER, 6))
+        texts.append(" ".join(chosen))
+    return texts
+
+
+def timed_queries(search, queries, top_k: int) -> tuple:
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results.append(search.search(query, 1, top_k))
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return latencies, results
+
+
+def percentile(sorted_values: list, share: float) -> float:
+    return sorted_values[min(int(len(sorted_values) * share), len(sorted_values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=100000, help="embedded resumes")
+    parser.add_argument("--dimensions", type=int, default=256, help="embedding dimensions")
+    parser.add_argument("--queries", type=int, default=200, help="timed queries per configuration")
+    parser.add_argument("--top-k", type=int, default=10, help="results per query")
+    parser.add_argument("--probes", type=int, nargs="+", default=[4, 16, 32], help="IVF buckets scanned per query")
+    args = parser.parse_args()
+
+    embedder = HashingEmbedder(args.dimensions)
+    store = EmbeddingStore(None, args.dimensions, HashingEmbedder.VERSION)
+
+    started = time.perf_counter()
+    texts = build_corpus(args.resumes, seed=0)
+    for start in range(0, len(texts), 10000):
+        store.add([(start + offset + 1, 1, embedder.embed(text)) for offset, text in enumerate(texts[start:start + 10000])])
+    print(f"embedded {args.resumes} resumes in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    index = IvfIndex.build(store.vectors[:store.count])
+    print(f"built IVF index ({len(index.centroids)} lists) in {time.perf_counter() - started:.1f}s\n")
+
+    queries = [embedder.embed(text) for text in build_corpus(args.queries, seed=1)]
+    exact = SimilaritySearch(store, embedder, probes=0, exact_max_rows=args.resumes)
+    exact_latencies, exact_results = timed_queries(exact, queries, args.top_k)
+
+    print(f"{'search':<14}{'p50 (ms)':>10}{'p95 (ms)':>10}{'recall@' + str(args.top_k):>12}")
+    print(f"{'exact':<14}{statistics.median(exact_latencies):>10.2f}{percentile(exact_latencies, 0.95):>10.2f}{1.0:>12.3f}")
+    for probes in args.probes:
+        ivf = SimilaritySearch(store, embedder, probes=probes, exact_max_rows=0)
+        ivf.index = index
+        latencies, results = timed_queries(ivf, queries, args.top_k)
+        recall = statistics.mean(
+            len({resume_id for resume_id, _ in found} & {resume_id for resume_id, _ in expected}) / max(len(expected), 1)
+            for found, expected in zip(results, exact_results)
+        )
+        label = f"ivf {probes} probes"
+        print(f"{label:<14}{statistics.median(latencies):>10.2f}{percentile(latencies, 0.95):>10.2f}{recall:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
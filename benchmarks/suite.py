@@ -0,0 +1,79 @@
+"""Run the parser/analyzer micro-benchmarks and the API load test, and compare against a baseline.
+
+Writes one JSON report with every result (see benchmarks.report). Given
+``--baseline``, prints each result's median change against that report
+and exits with status 1 if any got slower by more than ``--threshold``.
+The load test runs in a child process so it can point the app at its own
+throwaway database before the app's settings are loaded.
+
+    python -m benchmarks.suite --output before.json
+    python -m benchmarks.suite --output after.json --baseline before.json --threshold 0.2
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import parser_analyzer  # noqa: E402
+from benchmarks.report import compare, load_report, print_results, write_report  # noqa: E402
+
+
+def run_api_load(documents: int, concurrency: int, batch_matches: int, seed: int) -> list:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "api_load.json")
+        subprocess.run([
+            sys.executable, "-m", "benchmarks.api_load",
+            "--documents", str(documents), "--concurrency", str(concurrency),
+            "--batch-matches", str(batch_matches), "--seed", str(seed), "--json", output
+        ], cwd=root, check=True, stdout=subprocess.DEVNULL)
+        return load_report(output)["results"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON report to write")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed median slowdown (0.2 = 20%%)")
+    parser.add_argument("--repeat", type=int, default=30, help="timed runs per micro-benchmark")
+    parser.add_argument("--documents", type=int, default=30, help="resumes uploaded by the load test")
+    parser.add_argument("--concurrency", type=int, default=8, help="load test client threads")
+    parser.add_argument("--batch-matches", type=int, default=5, help="batch job-match requests in the load test")
+    parser.add_argument("--skip-api", action="store_true", help="only run the micro-benchmarks")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = parser_analyzer.run(args.repeat, seed=args.seed)
+    if not args.skip_api:
+        results += run_api_load(args.documents, args.concurrency, args.batch_matches, args.seed)
+    print_results(results)
+
+    report = write_report(
+        args.output, results, benchmark="suite",
+        parameters={key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+    )
+    print(f"\nwrote {len(results)} results to {args.output}")
+
+    if args.baseline:
+        baseline = load_report(args.baseline)
+        if baseline["environment"].get("machine") != report["environment"]["machine"]:
+            print("warning: the baseline was recorded on a different machine type")
+        rows = compare(baseline, report, args.threshold)
+        width = max(len(row["name"]) for row in rows) + 2
+        print(f"\n{'benchmark':<{width}}{'baseline (ms)':>15}{'current (ms)':>14}{'change':>9}")
+        for row in rows:
+            baseline_ms = f"{row['baseline']:.3f}" if row["baseline"] is not None else "-"
+            change = f"{row['change']:+.0%}" if row["change"] is not None else "new"
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"{row['name']:<{width}}{baseline_ms:>15}{row['current']:>14.3f}{change:>9}{flag}")
+        regressions = [row for row in rows if row["regression"]]
+        if regressions:
+            print(f"\n{len(regressions)} result(s) slower than the baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,30 @@
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
 from app.core.config import settings
-from app.core.database import get_db, engine
-from app.models import Base
+from app.core.database import get_db, engine, async_engine
+from app.core.migrations import run_migrations
+from app.core.security import password_hasher
+from app.core.write_batcher import write_batcher
 from app.api import auth, resume, job_match
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.api.responses import FastJSONResponse
+from app.core.metrics import MetricsMiddleware, metrics
+from app.services.analysis_queue import analysis_queue
+from app.services.embeddings import embedding_maintainer
+from app.services.extraction_pool import extraction_pool
+from app.services.rescoring import analysis_rescorer
+from app.services.tfidf import corpus_maintainer
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Create or upgrade database tables
+run_migrations(engine)
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.VERSION,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -23,13 +34,37 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Request latency histograms (outermost, so CORS and error handling are timed too)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, registry=metrics)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(resume.router, prefix="/api/resume", tags=["resume"])
 app.include_router(job_match.router, prefix="/api/job", tags=["job matching"])
 
+@app.on_event("startup")
+async def startup():
+    await analysis_queue.start()
+    await corpus_maintainer.start()
+    await embedding_maintainer.start()
+    if settings.RESCORE_ON_STARTUP:
+        await analysis_rescorer.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await analysis_rescorer.stop()
+    await embedding_maintainer.stop()
+    await corpus_maintainer.stop()
+    await analysis_queue.stop()
+    write_batcher.stop()
+    extraction_pool.shutdown()
+    password_hasher.shutdown()
+    await async_engine.dispose()
+
 @app.get("/")
 async def root():
     return {"message": "AI Resume Analyzer API", "version": settings.VERSION}
@@ -37,3 +72,13 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": settings.APP_NAME}
+
+@app.get("/health/rescoring")
+async def rescoring_progress():
+    """Progress of the background re-scoring of outdated analyses"""
+    return analysis_rescorer.progress()
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics():
+    """Latency histograms, p50/p95/p99 and parse throughput in the Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
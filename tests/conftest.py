@@ -0,0 +1,51 @@
+"""Shared fixtures: the app against a throwaway SQLite database, with caches and stores kept in memory."""
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The app reads its settings at import time, so point it away from the real database first
+_directory = tempfile.mkdtemp(prefix="resume-analyzer-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_directory, 'test.db')}"
+os.environ["PARSE_CACHE_PATH"] = ""
+os.environ["ANALYSIS_CACHE_PATH"] = ""
+os.environ["EMBEDDING_STORE_PATH"] = ""
+os.environ["RESCORE_ON_STARTUP"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from benchmarks.corpus import docx_bytes  # noqa: E402
+
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+@pytest.fixture(scope="session")
+def client():
+    import main
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client) -> dict:
+    credentials = {"email": "tests@example.com", "password": "test-password"}
+    client.post("/api/auth/register", json={"name": "Test User", **credentials})
+    token = client.post("/api/auth/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def upload_resume(client, auth_headers):
+    """Upload a DOCX resume with the given lines and return its id"""
+    def upload(*lines: str) -> int:
+        response = client.post(
+            "/api/resume/upload", headers=auth_headers,
+            files={"file": ("resume.docx", docx_bytes("\n".join(lines)), DOCX)}
+        )
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+    return upload
@@ -0,0 +1,44 @@
+JOB = {
+    "job_description": "Backend engineer: PostgreSQL, MongoDB and AWS required, Python a plus, Kubernetes nice to have.",
+    "job_title": "Backend Engineer"
+}
+
+
+def test_single_and_batch_match_agree(client, auth_headers, upload_resume):
+    resume_id = upload_resume(
+        "Jordan Chen",
+        "Backend developer working with Python, PostgreSQL, MongoDB and AWS",
+        "Experience",
+        "Built REST services on PostgreSQL and MongoDB, deployed to AWS"
+    )
+
+    single = client.post(f"/api/job/match/{resume_id}", headers=auth_headers, json=JOB)
+    assert single.status_code == 200, single.text
+    batch = client.post("/api/job/match/batch", headers=auth_headers, json={**JOB, "resume_ids": [resume_id]})
+    assert batch.status_code == 200, batch.text
+
+    single, (batched,) = single.json(), batch.json()
+    assert len(single["overlapping_skills"]) >= 2
+    for field in ("match_score", "text_similarity", "overlapping_skills", "missing_skills", "suggestions"):
+        assert single[field] == batched[field], field
+
+
+def test_batch_ranking_blends_text_similarity(client, auth_headers, upload_resume):
+    # Lists every required skill, but reads nothing like the job description
+    scattered = upload_resume(
+        "Alex Rivera",
+        "Photographer and illustrator. Hobbies: PostgreSQL, MongoDB, AWS, Python, Kubernetes",
+        "Weddings, portraits, gallery exhibitions, darkroom printing, studio lighting"
+    )
+    # Misses Kubernetes, but is a backend engineer required for exactly this stack
+    focused = upload_resume(
+        "Sam Ortiz",
+        "Backend engineer: PostgreSQL, MongoDB and AWS required daily, Python a plus",
+        "Backend engineer for PostgreSQL, MongoDB and AWS services, Python backend engineer"
+    )
+
+    response = client.post("/api/job/match/batch", headers=auth_headers, json={**JOB, "resume_ids": [scattered, focused]})
+    assert response.status_code == 200, response.text
+    by_id = {match["resume_id"]: match for match in response.json()}
+    assert by_id[scattered]["match_score"] > by_id[focused]["match_score"]
+    assert [match["resume_id"] for match in response.json()] == [focused, scattered]
@@ -0,0 +1,20 @@
+import re
+
+from test_job_match import JOB
+
+
+def _count(client, series: str) -> int:
+    """Current value of a histogram's _count line on /metrics (0 before its first sample)"""
+    match = re.search(rf"^{re.escape(series)} (\d+)$", client.get("/metrics").text, re.MULTILINE)
+    return int(match.group(1)) if match else 0
+
+
+def test_single_match_records_job_match_timings(client, auth_headers, upload_resume):
+    resume_id = upload_resume("Riley Park", "Python and PostgreSQL developer on AWS")
+    series = ("job_match_seconds_count", 'job_match_scoring_seconds_count{mode="single"}')
+    before = [_count(client, name) for name in series]
+
+    response = client.post(f"/api/job/match/{resume_id}", headers=auth_headers, json=JOB)
+    assert response.status_code == 200, response.text
+
+    assert [_count(client, name) for name in series] == [count + 1 for count in before]